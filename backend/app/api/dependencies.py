@@ -2,6 +2,7 @@
 API Dependencies
 Shared dependencies for API endpoints
 """
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -15,6 +16,17 @@ from datetime import datetime, timedelta
 
 security = HTTPBearer()
 
+# Free users who already hit today's limit, keyed on (user_id, UTC date).
+# Only the blocked outcome is cached: a day's scan count never goes down
+# when scans are added, so a new scan (on any worker) cannot make an entry
+# stale, while an under-limit count could be outdated by the next insert.
+_scan_limit_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def clear_scan_limit_cache() -> None:
+    """Forget cached daily-limit results (used by tests)"""
+    _scan_limit_cache.clear()
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -76,13 +88,19 @@ async def check_scan_limits(
         
     # Check scans for today
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    scan_count = db.query(Scan).filter(
-        Scan.user_id == current_user.id,
-        Scan.created_at >= today_start
-    ).count()
-    
-    if scan_count >= 1:
+    cache_key = (current_user.id, today_start.date())
+
+    limit_reached = cache_key in _scan_limit_cache
+    if not limit_reached:
+        scan_count = db.query(Scan).filter(
+            Scan.user_id == current_user.id,
+            Scan.created_at >= today_start
+        ).count()
+        limit_reached = scan_count >= 1
+        if limit_reached:
+            _scan_limit_cache[cache_key] = scan_count
+
+    if limit_reached:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Daily scan limit reached. Please upgrade to Pro for unlimited scans."
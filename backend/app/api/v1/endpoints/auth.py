@@ -8,7 +8,12 @@ from datetime import datetime, timedelta
 
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, TokenWithUser, UserOnboardingUpdate
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import (
+    get_password_hash,
+    verify_password,
+    create_access_token,
+    clear_password_verify_cache,
+)
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.core.rate_limiting import (
@@ -152,9 +157,7 @@ async def login(request: Request, credentials: UserLogin, db: Session = Depends(
         )
 
     # Successful login - reset failed attempts and unlock account
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    user.last_failed_login = None
+    user.clear_lockout()
     db.commit()
 
     # Create access token
@@ -269,6 +272,7 @@ async def change_password(
 
     current_user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
+    clear_password_verify_cache()
     
     return {"message": "Password updated successfully"}
 
@@ -345,6 +349,7 @@ async def reset_password(
     user.reset_token = None
     user.reset_token_expires = None
     db.commit()
+    clear_password_verify_cache()
 
     return {"message": "Password reset successfully"}
 
@@ -6,6 +6,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Form, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
+import asyncio
 import shutil
 import os
 from pathlib import Path
@@ -29,6 +30,26 @@ from app.services.email import send_scan_complete_email
 
 router = APIRouter()
 
+# Chunk size used when copying uploads to disk
+UPLOAD_COPY_BUFSIZE = 1024 * 1024
+
+
+def _save_upload(file: UploadFile, dest: Path) -> None:
+    """Copy an uploaded file to disk one chunk at a time"""
+    with open(dest, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer, UPLOAD_COPY_BUFSIZE)
+
+
+def _extract_php_files(zip_path: Path, extract_dir: Path) -> List[Path]:
+    """Extract the PHP files from an uploaded archive and list them"""
+    extract_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        # Only PHP sources are scanned; skipping assets saves a file write
+        # per image, stylesheet and script in typical theme/plugin archives
+        php_members = [name for name in zip_ref.namelist() if name.endswith(".php")]
+        zip_ref.extractall(extract_dir, members=php_members)
+    return list(extract_dir.rglob("*.php"))
+
 
 async def process_scan(scan_id: int, db: Session):
     """
@@ -55,13 +76,8 @@ async def process_scan(scan_id: int, db: Session):
             
         zip_path = zip_files[0]
         
-        # Extract files
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-            
-        # Find all PHP files
-        php_files = list(extract_dir.rglob("*.php"))
+        # Extract files and find all PHP files, off the event loop
+        php_files = await asyncio.to_thread(_extract_php_files, zip_path, extract_dir)
         
         # Initialize scanner
         scanner = WordPressScanner(
@@ -159,8 +175,7 @@ async def upload_scan(
     scan_dir.mkdir(parents=True, exist_ok=True)
     
     file_path = scan_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await asyncio.to_thread(_save_upload, file, file_path)
         
     # Start background task
     background_tasks.add_task(process_scan, db_scan.id, db)
@@ -271,18 +286,11 @@ async def estimate_scan_tokens(
             
             # Save uploaded file
             zip_path = temp_path / file.filename
-            with open(zip_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            await asyncio.to_thread(_save_upload, file, zip_path)
             
-            # Extract files
+            # Extract files and find all PHP files, off the event loop
             extract_dir = temp_path / "extracted"
-            extract_dir.mkdir(parents=True, exist_ok=True)
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Find all PHP files
-            php_files = list(extract_dir.rglob("*.php"))
+            php_files = await asyncio.to_thread(_extract_php_files, zip_path, extract_dir)
             
             # Initialize scanner
             scanner = WordPressScanner(
@@ -351,8 +359,7 @@ async def start_async_scan(
     scan_dir.mkdir(parents=True, exist_ok=True)
 
     file_path = scan_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    await asyncio.to_thread(_save_upload, file, file_path)
 
     # Queue Celery task
     task = run_wordpress_scan.delay(db_scan.id)
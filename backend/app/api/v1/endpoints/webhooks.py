@@ -7,6 +7,9 @@ from typing import List, Optional
 import uuid
 import logging
 
+import httpx
+import redis
+
 from app.db.session import get_db
 from app.models.user import User
 from app.models.webhook_config import WebhookConfig
@@ -17,9 +20,11 @@ from app.schemas.webhook import (
     WebhookConfigResponse,
     WebhookDeliveryListResponse,
     WebhookTestRequest,
-    WebhookTestResponse
+    WebhookTestResponse,
+    WebhookCircuitResetResponse
 )
 from app.services.webhooks.crypto import get_webhook_crypto
+from app.services.webhooks.circuit_breaker import get_webhook_circuit_breaker
 from app.services.webhooks.webhook_service import WebhookService
 
 router = APIRouter()
@@ -263,6 +268,56 @@ async def test_webhook(
     return WebhookTestResponse(**result)
 
 
+@router.post("/{webhook_id}/reset-circuit", response_model=WebhookCircuitResetResponse)
+async def reset_circuit(
+    webhook_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Close the delivery circuit breaker for a webhook's endpoint
+
+    Deliveries fast-fail after repeated endpoint failures; this lets the
+    owner resume deliveries once the endpoint is fixed. Circuits are scoped
+    per user, so this never affects other users of the same host.
+    """
+    webhook = db.query(WebhookConfig).filter(
+        WebhookConfig.id == webhook_id,
+        WebhookConfig.user_id == str(current_user.id)
+    ).first()
+    
+    if not webhook or not webhook.url:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook configuration not found"
+        )
+    
+    crypto = get_webhook_crypto()
+    try:
+        url = crypto.decrypt_url(webhook.url)
+    except Exception as e:
+        logger.error(f"Failed to decrypt webhook URL: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to decrypt URL: {str(e)}"
+        )
+    
+    circuit_breaker = get_webhook_circuit_breaker()
+    bucket = circuit_breaker.bucket_for(webhook.user_id, url)
+    try:
+        circuit_breaker.reset(bucket)
+    except redis.RedisError as e:
+        logger.error(f"Failed to reset webhook circuit for {webhook_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Circuit breaker store unavailable"
+        )
+    
+    logger.info(f"Reset webhook circuit for webhook {webhook_id}")
+    
+    return WebhookCircuitResetResponse(host=httpx.URL(url).host, reset=True)
+
+
 @router.get("/{webhook_id}/deliveries", response_model=WebhookDeliveryListResponse)
 async def get_webhook_deliveries(
     webhook_id: str,
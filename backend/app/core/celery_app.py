@@ -1,9 +1,55 @@
 """
 Celery configuration for background task processing
 """
+from typing import Any
+
+import orjson
 from celery import Celery
+from kombu.serialization import register
+from kombu.utils import json as kombu_json
+
 from app.core.config import settings
 
+# orjson handles datetime natively but would emit it as a bare string;
+# passing it through to kombu's encoder keeps kombu's {"__type__": ...}
+# envelopes (datetime, date, time, Decimal, registered types) so values
+# round-trip the same as with kombu's stock JSON codec. UUIDs are the one
+# exception: orjson always encodes them as plain strings.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+_kombu_json_encoder = kombu_json.JSONEncoder()
+
+
+def _restore_kombu_types(obj: Any) -> Any:
+    """Rebuild kombu-enveloped values, mirroring kombu's json object_hook"""
+    if isinstance(obj, dict):
+        return kombu_json.object_hook(
+            {key: _restore_kombu_types(value) for key, value in obj.items()}
+        )
+    if isinstance(obj, list):
+        return [_restore_kombu_types(value) for value in obj]
+    return obj
+
+
+def orjson_dumps(obj: Any) -> bytes:
+    """Encode a message body with orjson, deferring custom types to kombu"""
+    return orjson.dumps(obj, default=_kombu_json_encoder.default, option=_ORJSON_OPTIONS)
+
+
+def orjson_loads(data: Any) -> Any:
+    """Decode a message body with orjson and restore kombu-enveloped types"""
+    return _restore_kombu_types(orjson.loads(data))
+
+
+# Back the JSON codec with orjson so JSON messages (older producers, or
+# CELERY_SERIALIZER=json during a rollout) decode faster
+register(
+    "json",
+    orjson_dumps,
+    orjson_loads,
+    content_type="application/json",
+    content_encoding="utf-8",
+)
+
 celery_app = Celery(
     "coderenew",
     broker=settings.REDIS_URL,
@@ -11,10 +57,18 @@ celery_app = Celery(
     include=["app.tasks.scan_tasks", "app.tasks.epss_tasks", "app.tasks.webhook_tasks"],
 )
 
+# Workers only accept the content types listed here, so switching to
+# msgpack must be a two-step rollout:
+#   1. Deploy everywhere with CELERY_SERIALIZER=json. Every worker now
+#      accepts msgpack while producers still send JSON.
+#   2. Once no worker runs the old accept_content=["json"] config, unset
+#      CELERY_SERIALIZER (default msgpack) and deploy again.
+# Skipping step 1 makes old workers reject msgpack messages with
+# ContentDisallowed during a rolling deploy.
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=settings.CELERY_SERIALIZER,
+    accept_content=["msgpack", "json"],
+    result_serializer=settings.CELERY_SERIALIZER,
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PASSWORD_HASH_COST: int = 12  # bcrypt log2 rounds (4-31)
+    PASSWORD_VERIFY_CACHE: bool = False  # Memoize verify_password results (always on when TESTING)
 
     # Anthropic Claude API
     ANTHROPIC_API_KEY: str
@@ -35,6 +37,11 @@ class Settings(BaseSettings):
     # Webhook Encryption
     WEBHOOK_ENCRYPTION_KEY: str = ""  # Fernet key for encrypting webhook URLs
 
+    # Webhook circuit breaker (per endpoint host)
+    WEBHOOK_CB_FAILURE_THRESHOLD: int = 5
+    WEBHOOK_CB_WINDOW_SECONDS: int = 60
+    WEBHOOK_CB_OPEN_SECONDS: int = 300
+
     # Email Configuration
     EMAIL_PROVIDER: Literal["smtp", "sendgrid", "ses", "resend"] = "resend"
     EMAILS_FROM_EMAIL: str = "onboarding@resend.dev"
@@ -72,6 +79,7 @@ class Settings(BaseSettings):
     # Scanner Settings
     SCANNER_MAX_TOKENS_PER_BATCH: int = 150000
     SCANNER_MAX_RETRIES: int = 3
+    SCANNER_MAX_CONCURRENT_BATCHES: int = 4
 
     # CORS
     ALLOWED_ORIGINS: Any = ["http://localhost:3000"]
@@ -90,6 +98,7 @@ class Settings(BaseSettings):
 
     # Application Settings
     DEBUG: bool = False
+    TESTING: bool = False
     LOG_LEVEL: str = "INFO"
 
     # Redis Settings
@@ -98,6 +107,9 @@ class Settings(BaseSettings):
     REDIS_MAX_CONNECTIONS: int = 20
     REDIS_DEFAULT_TTL: int = 300  # 5 minutes
 
+    # Celery message format (json only while rolling out msgpack support)
+    CELERY_SERIALIZER: Literal["msgpack", "json"] = "msgpack"
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -6,6 +6,15 @@ import re
 import html
 from typing import Any
 
+# Longest address SMTP allows (RFC 5321 forward-path limit)
+MAX_EMAIL_LENGTH = 254
+
+# Basic email regex (RFC 5322 simplified)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Basic URL validation
+_URL_RE = re.compile(r'^https?://[a-zA-Z0-9.-]+(?:\:[0-9]+)?(?:/[^s]*)?$')
+
 
 def sanitize_html(value: str) -> str:
     """
@@ -72,14 +81,17 @@ def validate_email_format(email: str) -> str:
     if not email or not isinstance(email, str):
         raise ValueError("Email must be a non-empty string")
 
-    # Basic email regex (RFC 5322 simplified)
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    email = email.strip()
 
-    if not re.match(email_pattern, email):
+    # Cheap checks first: most malformed input never reaches the regex
+    if "@" not in email or len(email) > MAX_EMAIL_LENGTH:
+        raise ValueError("Invalid email format")
+
+    if not _EMAIL_RE.match(email):
         raise ValueError("Invalid email format")
 
     # Normalize to lowercase
-    return email.lower().strip()
+    return email.lower()
 
 
 def sanitize_filename(filename: str) -> str:
@@ -138,16 +150,16 @@ def validate_url(url: str) -> str:
     if not url or not isinstance(url, str):
         raise ValueError("URL must be a non-empty string")
 
+    url = url.strip()
+
     # Allow only http/https schemes
     if not url.startswith(('http://', 'https://')):
         raise ValueError("URL must start with http:// or https://")
 
-    # Basic URL validation
-    url_pattern = r'^https?://[a-zA-Z0-9.-]+(?:\:[0-9]+)?(?:/[^s]*)?$'
-    if not re.match(url_pattern, url):
+    if not _URL_RE.match(url):
         raise ValueError("Invalid URL format")
 
-    return url.strip()
+    return url
 
 
 def truncate_string(value: str, max_length: int = 1000) -> str:
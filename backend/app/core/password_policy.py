@@ -3,20 +3,31 @@ Password policy validation
 Enforces strong password requirements to prevent weak credentials
 """
 import re
-from typing import Set
+from typing import FrozenSet
 
 # Common weak passwords (top 100 most commonly used passwords)
 # In production, consider loading from a larger file or using a library like 'pwned-passwords'
-COMMON_PASSWORDS: Set[str] = {
+COMMON_PASSWORDS: FrozenSet[str] = frozenset({
     "password", "123456", "123456789", "12345678", "12345", "1234567", "password1",
     "qwerty", "abc123", "111111", "123123", "admin", "letmein", "welcome", "monkey",
     "1234567890", "password123", "qwerty123", "000000", "1234", "dragon", "master",
     "sunshine", "princess", "football", "shadow", "iloveyou", "superman", "michael",
     "jesus", "ninja", "mustang", "121212", "batman", "passw0rd", "trustno1", "starwars",
     "charlie", "654321", "ashley", "bailey", "access", "love", "whatever", "jordan",
-    "hunter", "aa123456", "lovely", "hello", "password!", "password1!", "Password1",
-    "Password123", "qwertyuiop", "test", "admin123", "root", "welcome123",
-}
+    "hunter", "aa123456", "lovely", "hello", "password!", "password1!",
+    "qwertyuiop", "test", "admin123", "root", "welcome123",
+})
+
+
+# Characters that satisfy the special character requirement
+SPECIAL_CHARACTERS = "!@#$%^&*()_+-=[]{};:'\",.<>?/\\|`~"
+
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_RE = re.compile(f"[{re.escape(SPECIAL_CHARACTERS)}]")
+_SEQUENTIAL_RE = re.compile(r'(012|123|234|345|456|567|678|789|abc|bcd|cde|def|efg|fgh)')
+_SEQUENTIAL_DIGITS_RE = re.compile(r'(012|123|234|345|456|567|678|789)')
 
 
 class PasswordValidationError(ValueError):
@@ -56,25 +67,25 @@ def validate_password_strength(password: str) -> str:
         )
 
     # Check for uppercase letter
-    if not re.search(r'[A-Z]', password):
+    if not _UPPERCASE_RE.search(password):
         raise PasswordValidationError(
             "Password must contain at least one uppercase letter"
         )
 
     # Check for lowercase letter
-    if not re.search(r'[a-z]', password):
+    if not _LOWERCASE_RE.search(password):
         raise PasswordValidationError(
             "Password must contain at least one lowercase letter"
         )
 
     # Check for digit
-    if not re.search(r'\d', password):
+    if not _DIGIT_RE.search(password):
         raise PasswordValidationError(
             "Password must contain at least one number"
         )
 
     # Check for special character
-    if not re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password):
+    if not _SPECIAL_RE.search(password):
         raise PasswordValidationError(
             "Password must contain at least one special character (!@#$%^&*()_+-=[]{}|;:,.<>?)"
         )
@@ -92,7 +103,7 @@ def validate_password_strength(password: str) -> str:
         )
 
     # Check for sequential characters (123, abc, etc.)
-    if re.search(r'(012|123|234|345|456|567|678|789|abc|bcd|cde|def|efg|fgh)', password.lower()):
+    if _SEQUENTIAL_RE.search(password.lower()):
         raise PasswordValidationError(
             "Password should not contain sequential characters"
         )
@@ -121,13 +132,13 @@ def get_password_strength_score(password: str) -> int:
         score += 10
 
     # Character variety
-    if re.search(r'[a-z]', password):
+    if _LOWERCASE_RE.search(password):
         score += 10
-    if re.search(r'[A-Z]', password):
+    if _UPPERCASE_RE.search(password):
         score += 10
-    if re.search(r'\d', password):
+    if _DIGIT_RE.search(password):
         score += 10
-    if re.search(r'[!@#$%^&*()_+\-=\[\]{};:\'",.<>?/\\|`~]', password):
+    if _SPECIAL_RE.search(password):
         score += 15
 
     # Complexity bonuses
@@ -140,7 +151,7 @@ def get_password_strength_score(password: str) -> int:
     # Penalty for common patterns
     if password.lower() in COMMON_PASSWORDS:
         score -= 50
-    if re.search(r'(012|123|234|345|456|567|678|789)', password):
+    if _SEQUENTIAL_DIGITS_RE.search(password):
         score -= 10
 
     return max(0, min(100, score))
@@ -2,20 +2,44 @@
 Security utilities for authentication and authorization
 JWT token handling and password hashing
 """
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Union
+from cachetools import LRUCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_COST,
+)
+
+# Results of verify_password keyed on (sha256(plain), hash). Only the bool
+# outcome is stored, never the plaintext. Opt-in via PASSWORD_VERIFY_CACHE.
+_verify_cache: LRUCache = LRUCache(maxsize=1024)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if not (settings.PASSWORD_VERIFY_CACHE or settings.TESTING):
+        return pwd_context.verify(plain_password, hashed_password)
+
+    key = (hashlib.sha256(plain_password.encode()).digest(), hashed_password)
+    result = _verify_cache.get(key)
+    if result is None:
+        result = pwd_context.verify(plain_password, hashed_password)
+        _verify_cache[key] = result
+    return result
+
+
+def clear_password_verify_cache() -> None:
+    """Drop memoized verify_password results after a password change"""
+    _verify_cache.clear()
 
 
 def get_password_hash(password: str) -> str:
@@ -53,6 +77,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Verified access-token claims keyed on the raw token string. Entries are
+# only served until the token's own exp claim, so caching never extends a
+# token's lifetime; invalid tokens are never cached.
+_token_cache: LRUCache = LRUCache(maxsize=1024)
+
+
+def clear_token_cache() -> None:
+    """Drop cached access-token claims, e.g. after rotating SECRET_KEY"""
+    _token_cache.clear()
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT access token
@@ -63,12 +98,22 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached["exp"] > time.time():
+            return dict(cached)
+        _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+
+    if isinstance(payload.get("exp"), (int, float)):
+        _token_cache[token] = dict(payload)
+    return payload
@@ -17,6 +17,8 @@ from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.error_handler import register_exception_handlers
 from app.core.rate_limiting import limiter
 from app.core.cache import close_redis
+from app.services.wordpress.mcp_client import close_mcp_client
+from app.services.claude.client import close_claude_clients
 
 
 @asynccontextmanager
@@ -35,6 +37,8 @@ async def lifespan(app: FastAPI):
     # Shutdown logic
     print(f"Shutting down {settings.PROJECT_NAME}")
     await close_redis()
+    await close_mcp_client()
+    close_claude_clients()
 
 
 # Create database tables (in production, use Alembic migrations)
@@ -5,5 +5,16 @@ from app.models.site import Site
 from app.models.scan import Scan
 from app.models.scan_result import ScanResult
 from app.models.order import Order
+from app.models.webhook_config import WebhookConfig
+from app.models.webhook_delivery import WebhookDelivery
 
-__all__ = ["Base", "User", "Site", "Scan", "ScanResult", "Order"]
+__all__ = [
+    "Base",
+    "User",
+    "Site",
+    "Scan",
+    "ScanResult",
+    "Order",
+    "WebhookConfig",
+    "WebhookDelivery",
+]
@@ -53,5 +53,11 @@ class User(Base):
     scans = relationship("Scan", back_populates="user", cascade="all, delete-orphan")
     webhook_configs = relationship("WebhookConfig", back_populates="user", cascade="all, delete-orphan")
 
+    def clear_lockout(self) -> None:
+        """Reset failed login tracking and lift any account lockout"""
+        self.failed_login_attempts = 0
+        self.locked_until = None
+        self.last_failed_login = None
+
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
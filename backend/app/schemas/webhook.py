@@ -162,3 +162,9 @@ class WebhookTestResponse(BaseModel):
     delivery_id: Optional[str]
     response_code: Optional[int]
     error: Optional[str]
+
+
+class WebhookCircuitResetResponse(BaseModel):
+    """Schema for webhook circuit breaker reset response"""
+    host: str
+    reset: bool
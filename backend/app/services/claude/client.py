@@ -3,6 +3,7 @@ Claude API Client
 Handles communication with Anthropic's Claude API with retry logic and circuit breaker
 """
 from typing import Optional, List, Dict, Any
+import asyncio
 import logging
 import anthropic
 from tenacity import (
@@ -21,6 +22,27 @@ from app.core.exceptions import ClaudeAPIError, CircuitBreakerOpenError
 
 logger = logging.getLogger(__name__)
 
+# SDK clients shared by every ClaudeClient (one per scanner) using the same
+# key, so scans reuse pooled keep-alive connections instead of paying a new
+# TCP+TLS handshake. The SDK client is synchronous and thread-safe, so unlike
+# the MCP client there is no event loop to rebind to.
+_sdk_clients: Dict[str, anthropic.Anthropic] = {}
+
+
+def _get_sdk_client(api_key: str) -> anthropic.Anthropic:
+    """Get the shared Anthropic SDK client for an API key"""
+    client = _sdk_clients.get(api_key)
+    if client is None:
+        client = _sdk_clients[api_key] = anthropic.Anthropic(api_key=api_key)
+    return client
+
+
+def close_claude_clients() -> None:
+    """Close the shared Anthropic SDK clients"""
+    for client in _sdk_clients.values():
+        client.close()
+    _sdk_clients.clear()
+
 
 class ClaudeClient:
     """Client for interacting with Claude API with resilience patterns"""
@@ -33,7 +55,7 @@ class ClaudeClient:
             api_key: Anthropic API key (defaults to settings)
         """
         self.api_key = api_key or settings.ANTHROPIC_API_KEY
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = _get_sdk_client(self.api_key)
         self.max_retries = settings.SCANNER_MAX_RETRIES
 
     def _is_retryable_error(self, exc: Exception) -> bool:
@@ -234,7 +256,10 @@ Provide your analysis in the following valid JSON format ONLY. Do not include an
         tool = get_compatibility_analysis_tool()
 
         try:
-            message = self._call_with_circuit_breaker(
+            # The SDK client is synchronous; run it in a thread so scanners
+            # can have several batches in flight at once
+            message = await asyncio.to_thread(
+                self._call_with_circuit_breaker,
                 messages=[{"role": "user", "content": prompt}],
                 tools=[tool],
                 tool_choice={"type": "tool", "name": tool["name"]},
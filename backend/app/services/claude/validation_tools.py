@@ -2,13 +2,18 @@
 Claude Tool Definitions for Validation
 Defines structured output schemas for tool use
 """
+from functools import lru_cache
 from typing import Dict, Any
 
 
+@lru_cache(maxsize=1)
 def get_compatibility_analysis_tool() -> Dict[str, Any]:
     """
     Returns Claude tool definition for structured WordPress compatibility analysis
-    
+
+    The definition is built once and shared by every caller, so treat it as
+    read-only. Enums are tuples to make accidental mutation fail loudly.
+
     Returns:
         Tool definition dictionary
     """
@@ -20,7 +25,7 @@ def get_compatibility_analysis_tool() -> Dict[str, Any]:
             "properties": {
                 "risk_level": {
                     "type": "string",
-                    "enum": ["safe", "warning", "critical"],
+                    "enum": ("safe", "warning", "critical"),
                     "description": "Overall risk assessment for the analyzed code"
                 },
                 "summary": {
@@ -38,18 +43,18 @@ def get_compatibility_analysis_tool() -> Dict[str, Any]:
                             },
                             "severity": {
                                 "type": "string",
-                                "enum": ["critical", "high", "medium", "low", "info"],
+                                "enum": ("critical", "high", "medium", "low", "info"),
                                 "description": "Severity of the issue"
                             },
                             "issue_type": {
                                 "type": "string",
-                                "enum": [
-                                    "deprecated_function", 
-                                    "removed_function", 
-                                    "breaking_change", 
-                                    "security", 
+                                "enum": (
+                                    "deprecated_function",
+                                    "removed_function",
+                                    "breaking_change",
+                                    "security",
                                     "best_practice"
-                                ],
+                                ),
                                 "description": "Type of compatibility issue"
                             },
                             "line": {
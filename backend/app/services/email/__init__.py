@@ -14,6 +14,12 @@ from .service import (
     get_email_service,
     create_email_service_from_settings,
 )
+from .notifications import (
+    send_email,
+    send_reset_password_email,
+    send_account_locked_email,
+    send_scan_complete_email,
+)
 
 __all__ = [
     "EmailService",
@@ -27,4 +33,8 @@ __all__ = [
     "MockProvider",
     "get_email_service",
     "create_email_service_from_settings",
+    "send_email",
+    "send_reset_password_email",
+    "send_account_locked_email",
+    "send_scan_complete_email",
 ]
@@ -4,7 +4,8 @@ Generates professional PDF reports for scan results
 """
 import io
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Tuple
+from cachetools import LRUCache
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,13 +16,22 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from app.models.scan import Scan
 from app.core.config import settings
 
+# Rendered reports keyed on every scan field the report shows, so a scan
+# whose results change gets a new key rather than a stale PDF. Bounded by
+# total bytes, not entry count, since report size grows with findings.
+_report_cache: LRUCache = LRUCache(maxsize=64 * 1024 * 1024, getsizeof=len)
+
+
+def clear_report_cache() -> None:
+    """Drop all cached report PDFs"""
+    _report_cache.clear()
+
 
 class PDFReportGenerator:
     """Generates PDF reports for CodeRenew scans"""
 
     def __init__(self, scan: Scan):
         self.scan = scan
-        self.buffer = io.BytesIO()
         self.styles = getSampleStyleSheet()
         self._setup_styles()
 
@@ -49,10 +59,47 @@ class PDFReportGenerator:
             leading=11
         ))
 
+    def _cache_key(self) -> Tuple:
+        """Key covering every scan and result field rendered in the report"""
+        scan = self.scan
+        return (
+            scan.id,
+            scan.site.url if scan.site else None,
+            scan.created_at,
+            scan.wordpress_version_from,
+            scan.wordpress_version_to,
+            scan.risk_level,
+            tuple(
+                (r.severity, r.issue_type, r.file_path, r.description)
+                for r in scan.results
+            ),
+        )
+
     def generate(self) -> bytes:
-        """Generate the PDF report"""
+        """Generate the PDF report, reusing an earlier render of the same scan"""
+        key = self._cache_key()
+        pdf = _report_cache.get(key)
+        if pdf is None:
+            buffer = io.BytesIO()
+            self.generate_to_stream(buffer)
+            pdf = buffer.getvalue()
+            if len(pdf) <= _report_cache.maxsize:
+                _report_cache[key] = pdf
+        return pdf
+
+    def generate_to_stream(self, fileobj: BinaryIO) -> None:
+        """
+        Write the PDF report to a binary file-like object
+
+        ReportLab still lays out the whole document before writing it, so
+        this saves the extra in-memory copy of the finished PDF rather than
+        the page data itself.
+
+        Args:
+            fileobj: Writable binary file object, e.g. an open file
+        """
         doc = SimpleDocTemplate(
-            self.buffer,
+            fileobj,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -132,5 +179,3 @@ class PDFReportGenerator:
         story.append(Paragraph("Generated by CodeRenew", self.styles['Normal_Small']))
 
         doc.build(story)
-        self.buffer.seek(0)
-        return self.buffer.getvalue()
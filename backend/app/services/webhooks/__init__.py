@@ -1,4 +1,13 @@
 """Webhooks service package"""
 from app.services.webhooks.crypto import WebhookCrypto, get_webhook_crypto
+from app.services.webhooks.circuit_breaker import (
+    WebhookCircuitBreaker,
+    get_webhook_circuit_breaker,
+)
 
-__all__ = ['WebhookCrypto', 'get_webhook_crypto']
+__all__ = [
+    'WebhookCrypto',
+    'get_webhook_crypto',
+    'WebhookCircuitBreaker',
+    'get_webhook_circuit_breaker',
+]
@@ -0,0 +1,161 @@
+"""
+Per-endpoint circuit breaker for webhook deliveries
+
+Failure counts live in Redis so every Celery worker shares the same view of
+a flaky endpoint. Once an endpoint crosses the failure threshold inside the
+counting window, deliveries to it fast-fail until the open key expires.
+
+Buckets are keyed on (user, endpoint host), not the bare host: shared hosts
+such as hooks.slack.com serve every tenant, so one user's broken endpoint
+must not open the circuit for anyone else.
+"""
+import logging
+
+import httpx
+import redis
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def is_endpoint_failure(exc: Exception) -> bool:
+    """
+    Check whether a delivery error says the endpoint itself is unhealthy
+
+    Connection errors, timeouts and 5xx responses count. 4xx responses
+    (revoked or misconfigured webhooks) do not.
+
+    Args:
+        exc: Exception raised while delivering
+
+    Returns:
+        True if the error should count against the circuit
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, RequestsConnectionError, Timeout))
+
+
+class WebhookCircuitBreaker:
+    """
+    Redis-backed circuit breaker keyed on user and endpoint host
+
+    Keys:
+        cb:{user_id}:{host}:fail - failure counter, expires after the counting window
+        cb:{user_id}:{host}:open - present while the circuit is open
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        failure_threshold: int = settings.WEBHOOK_CB_FAILURE_THRESHOLD,
+        window_seconds: int = settings.WEBHOOK_CB_WINDOW_SECONDS,
+        open_seconds: int = settings.WEBHOOK_CB_OPEN_SECONDS
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            redis_client: Synchronous Redis client
+            failure_threshold: Failures within the window that open the circuit
+            window_seconds: Lifetime of the failure counter
+            open_seconds: How long the circuit stays open
+        """
+        self.redis = redis_client
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+
+    @staticmethod
+    def bucket_for(user_id: str | int, url: str) -> str:
+        """
+        Get the bucket key for a user's webhook URL
+
+        Args:
+            user_id: Owner of the webhook configuration
+            url: Plain text webhook URL
+
+        Returns:
+            Bucket key of the form "{user_id}:{host}"
+        """
+        return f"{user_id}:{httpx.URL(url).host}"
+
+    def is_open(self, bucket: str) -> bool:
+        """
+        Check whether deliveries to a bucket should fast-fail
+
+        Args:
+            bucket: Bucket key from bucket_for()
+
+        Returns:
+            True if the circuit is open
+        """
+        try:
+            return bool(self.redis.exists(f"cb:{bucket}:open"))
+        except redis.RedisError as e:
+            logger.warning(f"Circuit breaker check failed for {bucket}: {e}")
+            return False
+
+    def record_failure(self, bucket: str) -> bool:
+        """
+        Record a failed delivery and open the circuit if over threshold
+
+        Args:
+            bucket: Bucket key from bucket_for()
+
+        Returns:
+            True if this failure opened the circuit
+        """
+        fail_key = f"cb:{bucket}:fail"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(fail_key)
+            pipe.expire(fail_key, self.window_seconds)
+            failures = pipe.execute()[0]
+
+            if failures >= self.failure_threshold:
+                self.redis.setex(f"cb:{bucket}:open", self.open_seconds, "1")
+                self.redis.delete(fail_key)
+                logger.warning(
+                    f"Webhook circuit opened for {bucket} after {failures} failures "
+                    f"(open for {self.open_seconds}s)"
+                )
+                return True
+        except redis.RedisError as e:
+            logger.warning(f"Circuit breaker update failed for {bucket}: {e}")
+        return False
+
+    def reset(self, bucket: str) -> None:
+        """
+        Close the circuit for a bucket and clear its failure count
+
+        Args:
+            bucket: Bucket key from bucket_for()
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        self.redis.delete(f"cb:{bucket}:fail", f"cb:{bucket}:open")
+        logger.info(f"Webhook circuit reset for {bucket}")
+
+
+# Singleton instance
+_circuit_breaker_instance: WebhookCircuitBreaker | None = None
+
+
+def get_webhook_circuit_breaker() -> WebhookCircuitBreaker:
+    """
+    Get singleton instance of WebhookCircuitBreaker
+
+    Returns:
+        WebhookCircuitBreaker instance
+    """
+    global _circuit_breaker_instance
+    if _circuit_breaker_instance is None:
+        _circuit_breaker_instance = WebhookCircuitBreaker(
+            redis.Redis.from_url(settings.REDIS_URL)
+        )
+    return _circuit_breaker_instance
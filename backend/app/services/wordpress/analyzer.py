@@ -7,6 +7,58 @@ import re
 from pathlib import Path
 from .deprecation_db import WordPressDeprecationDB, DeprecatedItem
 
+# Patterns are compiled once at import; the analyzer runs them on every file
+
+# Function calls: function_name(
+# This is a simple regex and won't catch all cases, but good enough for common patterns
+_FUNCTION_CALL_RE = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+
+# Common control structures that aren't functions
+_CONTROL_STRUCTURES = frozenset({
+    'if', 'while', 'for', 'foreach', 'switch', 'elseif', 'array', 'echo', 'print',
+    'isset', 'empty', 'unset', 'die', 'exit', 'return',
+})
+
+_ACTION_HOOK_RE = re.compile(r'add_action\s*\(\s*[\'"]([^\'"]+)[\'"]')
+_FILTER_HOOK_RE = re.compile(r'add_filter\s*\(\s*[\'"]([^\'"]+)[\'"]')
+
+# (issue type, severity, pattern, description)
+_SECURITY_PATTERNS = (
+    # Direct SQL queries (potential SQL injection)
+    ("sql_injection", "critical", re.compile(r'\$wpdb->query\s*\(\s*["\'].*?\$', re.IGNORECASE),
+     "Direct SQL query with variable interpolation - potential SQL injection"),
+    ("sql_injection", "critical", re.compile(r'mysql_query\s*\(', re.IGNORECASE),
+     "Deprecated mysql_query usage - security risk"),
+    ("sql_injection", "critical", re.compile(r'mysqli_query\s*\(.*?\$', re.IGNORECASE),
+     "Direct mysqli query with variables - use prepared statements"),
+    # XSS vulnerabilities (unescaped output)
+    ("xss", "high", re.compile(r'echo\s+\$_(GET|POST|REQUEST)\[', re.IGNORECASE),
+     "Direct output of user input - potential XSS"),
+    ("xss", "high", re.compile(r'print\s+\$_(GET|POST|REQUEST)\[', re.IGNORECASE),
+     "Direct output of user input - potential XSS"),
+    # File inclusion vulnerabilities
+    ("file_inclusion", "critical", re.compile(r'include\s*\(\s*\$_(GET|POST|REQUEST)', re.IGNORECASE),
+     "Dynamic file inclusion - potential RFI/LFI"),
+    ("file_inclusion", "critical", re.compile(r'require\s*\(\s*\$_(GET|POST|REQUEST)', re.IGNORECASE),
+     "Dynamic file inclusion - potential RFI/LFI"),
+)
+
+# Markers detect_patterns looks for, found in a single pass. Each alternative
+# is a zero-width lookahead so overlapping markers are all seen
+# (e.g. "echo $_GET[" is both variable output and user input).
+_PATTERN_MARKERS = {
+    "mysqli_new": r'(?i:new\s+mysqli\s*\()',
+    "admin_post_hook": r'add_action\s*\(\s*[\'"]admin_post_',
+    "nonce_check": r'wp_verify_nonce',
+    "user_input": r'\$_(?:GET|POST|REQUEST)\[',
+    "sanitization": r'sanitize_text_field|sanitize_email|absint|intval',
+    "variable_output": r'echo\s+\$|print\s+\$',
+    "escaping": r'esc_html|esc_attr|esc_url',
+}
+_PATTERN_MARKERS_RE = re.compile(
+    '|'.join(f'(?=(?P<{name}>{pattern}))' for name, pattern in _PATTERN_MARKERS.items())
+)
+
 
 class WordPressAnalyzer:
     """Static analyzer for WordPress PHP code"""
@@ -46,17 +98,10 @@ class WordPressAnalyzer:
         Returns:
             List of function names found
         """
-        # Pattern to match function calls: function_name(
-        # This is a simple regex and won't catch all cases, but good enough for common patterns
-        pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\('
-        matches = re.findall(pattern, php_code)
-        
-        # Filter out common control structures that aren't functions
-        control_structures = {'if', 'while', 'for', 'foreach', 'switch', 'elseif', 'array', 'echo', 'print', 'isset', 'empty', 'unset', 'die', 'exit', 'return'}
-        functions = [m for m in matches if m not in control_structures]
-        
-        # Return unique functions
-        return list(set(functions))
+        matches = _FUNCTION_CALL_RE.findall(php_code)
+
+        # Return unique functions, without control structures
+        return list(set(matches) - _CONTROL_STRUCTURES)
     
     def extract_hooks(self, php_code: str) -> List[Dict[str, Any]]:
         """
@@ -70,12 +115,8 @@ class WordPressAnalyzer:
         """
         hooks = []
         
-        # Pattern for add_action and add_filter
-        action_pattern = r'add_action\s*\(\s*[\'"]([^\'"]+)[\'"]'
-        filter_pattern = r'add_filter\s*\(\s*[\'"]([^\'"]+)[\'"]'
-        
         # Find all actions
-        for match in re.finditer(action_pattern, php_code):
+        for match in _ACTION_HOOK_RE.finditer(php_code):
             hooks.append({
                 "type": "action",
                 "name": match.group(1),
@@ -83,7 +124,7 @@ class WordPressAnalyzer:
             })
         
         # Find all filters
-        for match in re.finditer(filter_pattern, php_code):
+        for match in _FILTER_HOOK_RE.finditer(php_code):
             hooks.append({
                 "type": "filter",
                 "name": match.group(1),
@@ -104,28 +145,32 @@ class WordPressAnalyzer:
         """
         deprecated_usages = []
         
-        # Get all function calls
-        functions = self.extract_functions(php_code)
-        
-        # Check each against deprecation database
-        for func_name in functions:
-            deprecated_item = self.deprecation_db.check_function(func_name)
-            if deprecated_item:
-                # Find all occurrences in the code
-                pattern = rf'\b{re.escape(func_name)}\s*\('
-                for match in re.finditer(pattern, php_code):
-                    line_num = php_code[:match.start()].count('\n') + 1
-                    
-                    deprecated_usages.append({
-                        "function": func_name,
-                        "line": line_num,
-                        "deprecated_in": deprecated_item.deprecated_in,
-                        "removed_in": deprecated_item.removed_in,
-                        "replacement": deprecated_item.replacement,
-                        "severity": deprecated_item.severity,
-                        "description": deprecated_item.description,
-                    })
-        
+        # Intersect the called functions with the deprecation index in one
+        # hash join instead of a lookup per name
+        by_name = self.deprecation_db.by_name
+        deprecated_names = by_name.keys() & set(self.extract_functions(php_code))
+        if not deprecated_names:
+            return deprecated_usages
+
+        # Find all occurrences in one pass over the code
+        pattern = re.compile(
+            r'\b(' + '|'.join(map(re.escape, deprecated_names)) + r')\s*\('
+        )
+        for match in pattern.finditer(php_code):
+            func_name = match.group(1)
+            deprecated_item = by_name[func_name]
+            line_num = php_code[:match.start()].count('\n') + 1
+
+            deprecated_usages.append({
+                "function": func_name,
+                "line": line_num,
+                "deprecated_in": deprecated_item.deprecated_in,
+                "removed_in": deprecated_item.removed_in,
+                "replacement": deprecated_item.replacement,
+                "severity": deprecated_item.severity,
+                "description": deprecated_item.description,
+            })
+
         return deprecated_usages
     
     def detect_security_issues(self, php_code: str) -> List[Dict[str, Any]]:
@@ -139,59 +184,18 @@ class WordPressAnalyzer:
             List of potential security issues
         """
         issues = []
-        
-        # Check for direct SQL queries (potential SQL injection)
-        sql_patterns = [
-            (r'\$wpdb->query\s*\(\s*["\'].*?\$', "Direct SQL query with variable interpolation - potential SQL injection"),
-            (r'mysql_query\s*\(', "Deprecated mysql_query usage - security risk"),
-            (r'mysqli_query\s*\(.*?\$', "Direct mysqli query with variables - use prepared statements"),
-        ]
-        
-        for pattern, description in sql_patterns:
-            for match in re.finditer(pattern, php_code, re.IGNORECASE):
-                line_num = php_code[:match.start()].count('\n') + 1
-                issues.append({
-                    "type": "sql_injection",
-                    "line": line_num,
-                    "severity": "critical",
-                    "description": description,
-                    "code_snippet": self._get_line_context(php_code, line_num),
-                })
-        
-        # Check for XSS vulnerabilities (unescaped output)
-        xss_patterns = [
-            (r'echo\s+\$_(GET|POST|REQUEST)\[', "Direct output of user input - potential XSS"),
-            (r'print\s+\$_(GET|POST|REQUEST)\[', "Direct output of user input - potential XSS"),
-        ]
-        
-        for pattern, description in xss_patterns:
-            for match in re.finditer(pattern, php_code, re.IGNORECASE):
-                line_num = php_code[:match.start()].count('\n') + 1
-                issues.append({
-                    "type": "xss",
-                    "line": line_num,
-                    "severity": "high",
-                    "description": description,
-                    "code_snippet": self._get_line_context(php_code, line_num),
-                })
-        
-        # Check for file inclusion vulnerabilities
-        file_patterns = [
-            (r'include\s*\(\s*\$_(GET|POST|REQUEST)', "Dynamic file inclusion - potential RFI/LFI"),
-            (r'require\s*\(\s*\$_(GET|POST|REQUEST)', "Dynamic file inclusion - potential RFI/LFI"),
-        ]
-        
-        for pattern, description in file_patterns:
-            for match in re.finditer(pattern, php_code, re.IGNORECASE):
+
+        for issue_type, severity, pattern, description in _SECURITY_PATTERNS:
+            for match in pattern.finditer(php_code):
                 line_num = php_code[:match.start()].count('\n') + 1
                 issues.append({
-                    "type": "file_inclusion",
+                    "type": issue_type,
                     "line": line_num,
-                    "severity": "critical",
+                    "severity": severity,
                     "description": description,
                     "code_snippet": self._get_line_context(php_code, line_num),
                 })
-        
+
         return issues
     
     def detect_patterns(self, php_code: str) -> List[Dict[str, Any]]:
@@ -205,9 +209,15 @@ class WordPressAnalyzer:
             List of detected patterns
         """
         patterns = []
-        
+
+        markers: Set[str] = set()
+        for match in _PATTERN_MARKERS_RE.finditer(php_code):
+            markers.add(match.lastgroup)
+            if len(markers) == len(_PATTERN_MARKERS):
+                break
+
         # Check for direct database access (should use $wpdb)
-        if re.search(r'new\s+mysqli\s*\(', php_code, re.IGNORECASE):
+        if "mysqli_new" in markers:
             patterns.append({
                 "type": "anti_pattern",
                 "severity": "medium",
@@ -216,8 +226,8 @@ class WordPressAnalyzer:
             })
         
         # Check for proper nonce verification
-        if re.search(r'add_action\s*\(\s*[\'"]admin_post_', php_code):
-            if not re.search(r'wp_verify_nonce', php_code):
+        if "admin_post_hook" in markers:
+            if "nonce_check" not in markers:
                 patterns.append({
                     "type": "security",
                     "severity": "high",
@@ -226,15 +236,8 @@ class WordPressAnalyzer:
                 })
         
         # Check for proper data sanitization
-        if re.search(r'\$_(GET|POST|REQUEST)\[', php_code):
-            has_sanitization = any([
-                re.search(r'sanitize_text_field', php_code),
-                re.search(r'sanitize_email', php_code),
-                re.search(r'absint', php_code),
-                re.search(r'intval', php_code),
-            ])
-            
-            if not has_sanitization:
+        if "user_input" in markers:
+            if "sanitization" not in markers:
                 patterns.append({
                     "type": "security",
                     "severity": "high",
@@ -243,14 +246,8 @@ class WordPressAnalyzer:
                 })
         
         # Check for proper escaping on output
-        if re.search(r'echo\s+\$', php_code) or re.search(r'print\s+\$', php_code):
-            has_escaping = any([
-                re.search(r'esc_html', php_code),
-                re.search(r'esc_attr', php_code),
-                re.search(r'esc_url', php_code),
-            ])
-            
-            if not has_escaping:
+        if "variable_output" in markers:
+            if "escaping" not in markers:
                 patterns.append({
                     "type": "security",
                     "severity": "medium",
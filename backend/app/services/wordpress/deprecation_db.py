@@ -3,6 +3,7 @@ WordPress Deprecation Database
 Maintains a database of deprecated functions, hooks, and breaking changes across WordPress versions
 """
 from typing import List, Dict, Optional, Tuple
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from enum import Enum
 
@@ -16,9 +17,9 @@ class ChangeType(str, Enum):
     SECURITY_ISSUE = "security_issue"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeprecatedItem:
-    """Represents a deprecated WordPress item"""
+    """Represents a deprecated WordPress item (immutable, no per-instance __dict__)"""
     name: str
     deprecated_in: str  # Version deprecated
     removed_in: Optional[str]  # Version removed (if applicable)
@@ -146,6 +147,37 @@ class WordPressDeprecationDB:
             if item.deprecated_in not in self.by_version:
                 self.by_version[item.deprecated_in] = []
             self.by_version[item.deprecated_in].append(item)
+
+        # Sorted version keys with the matching positions in self.deprecations,
+        # so range queries are two binary searches per index
+        self._deprecated_keys, self._deprecated_positions = self._build_version_index(
+            (i, item.deprecated_in) for i, item in enumerate(self.deprecations)
+        )
+        self._removed_keys, self._removed_positions = self._build_version_index(
+            (i, item.removed_in) for i, item in enumerate(self.deprecations) if item.removed_in
+        )
+
+    def _build_version_index(self, entries) -> Tuple[List[Tuple[int, ...]], List[int]]:
+        """
+        Sort (position, version) entries by parsed version
+
+        Returns:
+            Parallel lists of sorted version tuples and item positions
+        """
+        parsed = sorted(
+            (self._parse_version(version), position) for position, version in entries
+        )
+        return [key for key, _ in parsed], [position for _, position in parsed]
+
+    @staticmethod
+    def _positions_in_range(
+        keys: List[Tuple[int, ...]],
+        positions: List[int],
+        from_parts: Tuple[int, ...],
+        to_parts: Tuple[int, ...]
+    ) -> List[int]:
+        """Positions whose version key lies within [from_parts, to_parts]"""
+        return positions[bisect_left(keys, from_parts):bisect_right(keys, to_parts)]
     
     def check_function(self, function_name: str) -> Optional[DeprecatedItem]:
         """
@@ -177,22 +209,15 @@ class WordPressDeprecationDB:
         from_parts = self._parse_version(version_from)
         to_parts = self._parse_version(version_to)
         
-        relevant_items = []
-        for item in self.deprecations:
-            deprecated_parts = self._parse_version(item.deprecated_in)
-            
-            # Check if deprecated version is in range
-            if from_parts <= deprecated_parts <= to_parts:
-                relevant_items.append(item)
-            
-            # Also check if removed in this range
-            if item.removed_in:
-                removed_parts = self._parse_version(item.removed_in)
-                if from_parts <= removed_parts <= to_parts:
-                    if item not in relevant_items:
-                        relevant_items.append(item)
-        
-        return relevant_items
+        # Items deprecated or removed in this range, in database order
+        positions = set(self._positions_in_range(
+            self._deprecated_keys, self._deprecated_positions, from_parts, to_parts
+        ))
+        positions.update(self._positions_in_range(
+            self._removed_keys, self._removed_positions, from_parts, to_parts
+        ))
+
+        return [self.deprecations[i] for i in sorted(positions)]
     
     def get_critical_changes(
         self,
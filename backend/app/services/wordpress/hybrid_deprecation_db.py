@@ -3,10 +3,17 @@ Hybrid Deprecation Database
 Combines local database with real-time MCP server data
 """
 from typing import List, Optional, Dict, Any
+import asyncio
 from cachetools import TTLCache
 from .deprecation_db import WordPressDeprecationDB, DeprecatedItem
 from .mcp_client import WordPressMCPClient
 
+# Range results shared by every instance (scanners build one per scan) and
+# by the sync and async lookups. Local-only results from an MCP failure go
+# in a short-lived cache so a down server is retried soon, not every call.
+_range_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+_fallback_cache: TTLCache = TTLCache(maxsize=256, ttl=10)
+
 
 class HybridDeprecationDB(WordPressDeprecationDB):
     """
@@ -17,9 +24,21 @@ class HybridDeprecationDB(WordPressDeprecationDB):
     def __init__(self):
         super().__init__()
         self.mcp_client = WordPressMCPClient()
-        # Cache for 1 hour, max 1000 items
-        self.cache = TTLCache(maxsize=1000, ttl=3600)
-        
+        self.cache = _range_cache
+
+    @staticmethod
+    def invalidate() -> None:
+        """Clear cached range and function lookups for all instances"""
+        _range_cache.clear()
+        _fallback_cache.clear()
+
+    def _cached_range(self, cache_key: str) -> Optional[List[DeprecatedItem]]:
+        """Get a cached range result, including local-only fallbacks"""
+        result = self.cache.get(cache_key)
+        if result is None:
+            result = _fallback_cache.get(cache_key)
+        return result
+
     async def get_deprecated_in_range_async(
         self,
         version_from: str,
@@ -36,29 +55,29 @@ class HybridDeprecationDB(WordPressDeprecationDB):
             Merged list of deprecated items
         """
         cache_key = f"range:{version_from}:{version_to}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-            
-        # Get local items first (fast)
-        local_items = super().get_deprecated_in_range(version_from, version_to)
-        
-        # Get MCP items
-        try:
-            mcp_items = await self.mcp_client.get_deprecations(version_from, version_to)
-        except Exception as e:
-            print(f"Hybrid DB: MCP lookup failed: {e}")
-            mcp_items = []
-        
-        # Merge items (prefer MCP for newer data, but keep local if MCP fails)
-        # Use a dict by name to deduplicate
-        merged_map = {item.name: item for item in local_items}
-        
-        for item in mcp_items:
-            # Overwrite or add
-            merged_map[item.name] = item
-            
-        result = list(merged_map.values())
-        
+        cached = self._cached_range(cache_key)
+        if cached is not None:
+            return cached
+
+        # Query MCP and the local DB concurrently
+        mcp_result, local_items = await asyncio.gather(
+            self.mcp_client.get_deprecations(version_from, version_to),
+            asyncio.to_thread(super().get_deprecated_in_range, version_from, version_to),
+            return_exceptions=True,
+        )
+        if isinstance(local_items, BaseException):
+            raise local_items
+
+        # The client reports an unreachable or failing server as None
+        if mcp_result is None or isinstance(mcp_result, BaseException):
+            print(f"Hybrid DB: MCP lookup failed: {mcp_result}")
+            _fallback_cache[cache_key] = local_items
+            return local_items
+
+        # Merge items by name in one pass; MCP entries come last so they
+        # overwrite local ones with newer data
+        result = list({item.name: item for item in [*local_items, *mcp_result]}.values())
+
         # Update cache
         self.cache[cache_key] = result
         return result
@@ -70,9 +89,14 @@ class HybridDeprecationDB(WordPressDeprecationDB):
     ) -> List[DeprecatedItem]:
         """
         Synchronous wrapper for backward compatibility.
-        Note: This ONLY returns local data to avoid async issues in sync context.
-        Use get_deprecated_in_range_async for full data.
+        Note: This never queries MCP to avoid async issues in sync context.
+        Merged results already cached by get_deprecated_in_range_async are
+        returned; otherwise only local data is.
         """
+        cached = self._cached_range(f"range:{version_from}:{version_to}")
+        if cached is not None:
+            return cached
+
         print("Warning: Using synchronous get_deprecated_in_range, only local data will be returned.")
         return super().get_deprecated_in_range(version_from, version_to)
 
@@ -4,10 +4,48 @@ Client for interacting with WordPress Model Context Protocol (MCP) servers
 to retrieve real-time deprecation and function information.
 """
 from typing import List, Dict, Any, Optional
+import asyncio
 import httpx
 from app.core.config import settings
 from .deprecation_db import DeprecatedItem, ChangeType
 
+# Shared HTTP client so MCP lookups reuse keep-alive connections instead of
+# a new TCP+TLS handshake per call. An AsyncClient is bound to the event loop
+# it runs on, and Celery scan tasks use a fresh loop per scan, so the client
+# is rebuilt when the running loop changes.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for the running event loop"""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        if _http_client is not None:
+            # Its pooled connections belong to the old loop, and closing them
+            # can fail once that loop is gone; the reference is dropped either
+            # way so the transports are released with it.
+            try:
+                await _http_client.aclose()
+            except Exception:
+                pass
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_mcp_client() -> None:
+    """Close the shared MCP HTTP client"""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _http_client_loop = None
+
 
 class WordPressMCPClient:
     """Client for WordPress MCP server"""
@@ -20,9 +58,10 @@ class WordPressMCPClient:
             base_url: Base URL of the MCP server
             api_key: API key for authentication
         """
-        self.base_url = base_url or getattr(settings, "WORDPRESS_MCP_URL", "https://wordpress.com/mcp")
-        self.api_key = api_key or getattr(settings, "WORDPRESS_MCP_API_KEY", None)
-        self.enabled = getattr(settings, "WORDPRESS_MCP_ENABLED", True)
+        # Settings are read once here; lookups only check these attributes
+        self.base_url = base_url or settings.WORDPRESS_MCP_URL
+        self.api_key = api_key or settings.WORDPRESS_MCP_API_KEY
+        self.enabled = bool(settings.WORDPRESS_MCP_ENABLED)
         
         self.headers = {
             "Content-Type": "application/json",
@@ -35,7 +74,7 @@ class WordPressMCPClient:
         self,
         version_from: str,
         version_to: str
-    ) -> List[DeprecatedItem]:
+    ) -> Optional[List[DeprecatedItem]]:
         """
         Query MCP for deprecations in version range
         
@@ -44,30 +83,31 @@ class WordPressMCPClient:
             version_to: Target version
             
         Returns:
-            List of deprecated items
+            List of deprecated items (empty if MCP is disabled), or None if
+            the server could not be queried
         """
         if not self.enabled:
             return []
             
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/deprecations",
-                    params={"from": version_from, "to": version_to},
-                    headers=self.headers,
-                    timeout=5.0
-                )
-                
-                if response.status_code != 200:
-                    print(f"MCP Error: {response.status_code} - {response.text}")
-                    return []
-                
-                data = response.json()
-                return self._parse_deprecations(data)
-                
+            client = await _get_http_client()
+            response = await client.get(
+                f"{self.base_url}/deprecations",
+                params={"from": version_from, "to": version_to},
+                headers=self.headers,
+                timeout=5.0
+            )
+
+            if response.status_code != 200:
+                print(f"MCP Error: {response.status_code} - {response.text}")
+                return None
+
+            data = response.json()
+            return self._parse_deprecations(data)
+
         except Exception as e:
             print(f"Error querying MCP server: {e}")
-            return []
+            return None
             
     async def get_function_info(self, function_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -83,17 +123,17 @@ class WordPressMCPClient:
             return None
             
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/functions/{function_name}",
-                    headers=self.headers,
-                    timeout=3.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                return None
-                
+            client = await _get_http_client()
+            response = await client.get(
+                f"{self.base_url}/functions/{function_name}",
+                headers=self.headers,
+                timeout=3.0
+            )
+
+            if response.status_code == 200:
+                return response.json()
+            return None
+
         except Exception as e:
             print(f"Error querying MCP server for function {function_name}: {e}")
             return None
@@ -5,14 +5,20 @@ Analyzes WordPress code for compatibility issues
 from typing import List, Dict, Any, Tuple
 from pathlib import Path
 import asyncio
+import heapq
 from .analyzer import WordPressAnalyzer
 from .hybrid_deprecation_db import HybridDeprecationDB
 from .token_optimizer import TokenOptimizer
-from .token_optimizer import TokenOptimizer
 from app.services.claude.client import ClaudeClient
 from app.core.config import settings
 
 
+def _read_text(path: Path) -> str:
+    """Read a source file leniently, as every scan pass does"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
 class WordPressScanner:
     """
     Scanner for WordPress themes and plugins.
@@ -23,10 +29,18 @@ class WordPressScanner:
     MAX_TOKENS_PER_BATCH = settings.SCANNER_MAX_TOKENS_PER_BATCH
     CHARS_PER_TOKEN = 4  # Rough estimate
     MAX_CHARS_PER_BATCH = MAX_TOKENS_PER_BATCH * CHARS_PER_TOKEN
+    # Files larger than this are estimated from their size instead of being
+    # read and tokenized
+    EXACT_TOKEN_COUNT_MAX_BYTES = 1_000_000
+    # Characters exact-counted by estimate_total_tokens to calibrate the
+    # chars-per-token ratio used for fast estimates
+    CALIBRATION_SAMPLE_CHARS = 2048
     
     # Retry configuration
     MAX_RETRIES = settings.SCANNER_MAX_RETRIES
     RETRY_DELAY = 2  # seconds
+    # Claude requests in flight at once per scan
+    MAX_CONCURRENT_BATCHES = settings.SCANNER_MAX_CONCURRENT_BATCHES
 
     def __init__(self, version_from: str, version_to: str):
         """
@@ -42,7 +56,13 @@ class WordPressScanner:
         self.analyzer = WordPressAnalyzer()
         self.deprecation_db = HybridDeprecationDB()
         self.optimizer = TokenOptimizer()
-        
+
+        # Token estimates keyed on (path, mtime_ns, size); a file edited
+        # mid-scan gets a new key, so stale counts are never returned
+        self._token_estimates: Dict[Tuple[str, int, int], int] = {}
+        # Ratio used by fast estimates, refined by _calibrate_chars_per_token
+        self.chars_per_token: float = self.CHARS_PER_TOKEN
+
         # Statistics
         self.stats = {
             "files_processed": 0,
@@ -101,21 +121,31 @@ class WordPressScanner:
         batches = self._batch_files(php_files)
         print(f"Created {len(batches)} batches for analysis")
         
-        # Process each batch with AI
-        for i, batch in enumerate(batches):
-            print(f"Processing batch {i+1}/{len(batches)} ({len(batch)} files)...")
-            
-            try:
-                batch_issues = await self._scan_batch(batch)
-                all_issues.extend(batch_issues)
-                self.stats["batches_processed"] += 1
-                self.stats["ai_issues_found"] += len(batch_issues)
-            except Exception as e:
-                print(f"Error processing batch {i+1}: {str(e)}")
-                # Log error details for debugging
-                import traceback
-                traceback.print_exc()
-                # Continue with next batch even if one fails
+        # Process batches with AI, a bounded number at a time
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_BATCHES)
+
+        async def process_batch(i: int, batch: List[Path]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                print(f"Processing batch {i+1}/{len(batches)} ({len(batch)} files)...")
+                
+                try:
+                    batch_issues = await self._scan_batch(batch)
+                    self.stats["batches_processed"] += 1
+                    self.stats["ai_issues_found"] += len(batch_issues)
+                    return batch_issues
+                except Exception as e:
+                    print(f"Error processing batch {i+1}: {str(e)}")
+                    # Log error details for debugging
+                    import traceback
+                    traceback.print_exc()
+                    # Continue with other batches even if one fails
+                    return []
+
+        batch_results = await asyncio.gather(
+            *(process_batch(i, batch) for i, batch in enumerate(batches))
+        )
+        for batch_issues in batch_results:
+            all_issues.extend(batch_issues)
                 
         print(f"Scan complete: {len(all_issues)} total issues found")
         return all_issues
@@ -134,8 +164,9 @@ class WordPressScanner:
         
         for file_path in file_paths:
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                # Read off the event loop; files stay one at a time so a
+                # large upload is never held in memory all at once
+                content = await asyncio.to_thread(_read_text, file_path)
                 
                 if not content.strip():
                     continue
@@ -234,46 +265,118 @@ class WordPressScanner:
         
         return batches
     
-    def _estimate_tokens_for_file(self, file_path: Path) -> int:
+    def _estimate_tokens_for_file(self, file_path: Path, exact: bool = False) -> int:
         """
-        Estimate token count for a file using optimizer
-        
+        Estimate token count for a file
+
+        By default the estimate comes from the file size and the
+        chars_per_token ratio, without reading the file. With exact=True
+        the file is read and tokenized by the optimizer; exact counts are
+        cached per scanner, and files over EXACT_TOKEN_COUNT_MAX_BYTES
+        still use the chars-per-token heuristic.
+
         Args:
             file_path: Path to the file
-            
+            exact: Tokenize the file contents instead of estimating from size
+
         Returns:
             Estimated token count
         """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                return self.optimizer.count_tokens(content)
+            stat = file_path.stat()
+            if not exact:
+                return self._tokens_for_size(stat.st_size)
+
+            key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+            tokens = self._token_estimates.get(key)
+            if tokens is None:
+                if stat.st_size > self.EXACT_TOKEN_COUNT_MAX_BYTES:
+                    tokens = stat.st_size // self.CHARS_PER_TOKEN
+                else:
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        tokens = self.optimizer.count_tokens(f.read())
+                self._token_estimates[key] = tokens
+            return tokens
         except Exception:
             return 1000  # Default estimate if we can't read file
-    
-    def estimate_total_tokens(self, file_paths: List[Path]) -> Dict[str, Any]:
+
+    def _tokens_for_size(self, size: int) -> int:
+        """
+        Fast token estimate for a file of the given size
+
+        Args:
+            size: File size in bytes
+
+        Returns:
+            Estimated token count
+        """
+        return max(1, int(size / self.chars_per_token))
+
+    def _calibrate_chars_per_token(self, file_paths: List[Path]) -> None:
+        """
+        Derive chars_per_token from an exact count of a small sample
+
+        Reads the first CALIBRATION_SAMPLE_CHARS of the first readable file,
+        so fast estimates track the project's actual code density.
+
+        Args:
+            file_paths: PHP files about to be estimated
+        """
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    sample = f.read(self.CALIBRATION_SAMPLE_CHARS)
+            except OSError:
+                continue
+            tokens = self.optimizer.count_tokens(sample)
+            if tokens > 0:
+                self.chars_per_token = len(sample) / tokens
+                return
+
+    def estimate_total_tokens(self, file_paths: List[Path], exact: bool = False) -> Dict[str, Any]:
         """
         Estimate total tokens needed for analyzing a project
+
+        Fast estimates calibrate chars_per_token once on a small sample and
+        then only stat each file. Exact estimates tokenize every file.
         
         Args:
             file_paths: List of file paths to analyze
+            exact: Tokenize every file instead of estimating from sizes
             
         Returns:
             Dictionary with token estimates and batch information
         """
-        php_files = [f for f in file_paths if f.suffix == '.php' and f.exists()]
-        
-        total_tokens = 0
-        file_estimates = []
+        # One stat per file: it filters out missing files and supplies the
+        # size for both the fast estimate and the report
+        sizes: Dict[Path, int] = {}
+        for file_path in file_paths:
+            if file_path.suffix != '.php':
+                continue
+            try:
+                sizes[file_path] = file_path.stat().st_size
+            except OSError:
+                continue
+        php_files = list(sizes)
         
-        for file_path in php_files:
-            tokens = self._estimate_tokens_for_file(file_path)
-            total_tokens += tokens
-            file_estimates.append({
-                'file': str(file_path),
-                'estimated_tokens': tokens,
-                'size_bytes': file_path.stat().st_size if file_path.exists() else 0
-            })
+        if exact:
+            tokens = [self._estimate_tokens_for_file(f, exact=True) for f in php_files]
+        else:
+            self._calibrate_chars_per_token(php_files)
+            tokens = [self._tokens_for_size(size) for size in sizes.values()]
+        
+        total_tokens = sum(tokens)
+        
+        # Top 10 largest, without building an entry for every file
+        largest = heapq.nlargest(10, range(len(php_files)), key=tokens.__getitem__)
+        file_estimates = [
+            {
+                'file': str(php_files[i]),
+                'estimated_tokens': tokens[i],
+                'size_bytes': sizes[php_files[i]],
+            }
+            for i in largest
+        ]
         
         # Estimate number of batches needed
         estimated_batches = max(1, (total_tokens // self.MAX_TOKENS_PER_BATCH) + 1)
@@ -291,7 +394,7 @@ class WordPressScanner:
             'estimated_batches': estimated_batches,
             'tokens_per_batch_limit': self.MAX_TOKENS_PER_BATCH,
             'estimated_cost_usd': round(estimated_cost, 2),
-            'file_estimates': sorted(file_estimates, key=lambda x: x['estimated_tokens'], reverse=True)[:10],  # Top 10 largest
+            'file_estimates': file_estimates,
             'context_overflow_risk': 'high' if total_tokens > self.MAX_TOKENS_PER_BATCH * 10 else 'medium' if total_tokens > self.MAX_TOKENS_PER_BATCH * 3 else 'low'
         }
 
@@ -306,35 +409,40 @@ class WordPressScanner:
         Returns:
             List of issues found in this batch
         """
-        # Read all files in batch
+        # Read all files in batch concurrently, off the event loop
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(_read_text, file_path) for file_path in batch),
+            return_exceptions=True
+        )
+
         files_content = []
-        for file_path in batch:
+        for file_path, content in zip(batch, contents):
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if content.strip():
-                        # Optimize code if enabled
-                        if self.stats.get("optimization_enabled", True):
-                            optimization_result = self.optimizer.optimize_code(content)
-                            optimized_content = optimization_result['optimized_code']
-                            
-                            # Update stats
-                            self.stats["original_tokens"] += optimization_result['original_tokens']
-                            self.stats["optimized_tokens"] += optimization_result['optimized_tokens']
-                            self.stats["tokens_saved"] += optimization_result['tokens_saved']
-                            
-                            files_content.append({
-                                'filename': file_path.name,
-                                'filepath': str(file_path),
-                                'content': optimized_content,
-                                'original_content': content  # Keep original for reference if needed
-                            })
-                        else:
-                            files_content.append({
-                                'filename': file_path.name,
-                                'filepath': str(file_path),
-                                'content': content,
-                            })
+                if isinstance(content, Exception):
+                    raise content
+                if content.strip():
+                    # Optimize code if enabled
+                    if self.stats.get("optimization_enabled", True):
+                        optimization_result = self.optimizer.optimize_code(content)
+                        optimized_content = optimization_result['optimized_code']
+                        
+                        # Update stats
+                        self.stats["original_tokens"] += optimization_result['original_tokens']
+                        self.stats["optimized_tokens"] += optimization_result['optimized_tokens']
+                        self.stats["tokens_saved"] += optimization_result['tokens_saved']
+                        
+                        files_content.append({
+                            'filename': file_path.name,
+                            'filepath': str(file_path),
+                            'content': optimized_content,
+                            'original_content': content  # Keep original for reference if needed
+                        })
+                    else:
+                        files_content.append({
+                            'filename': file_path.name,
+                            'filepath': str(file_path),
+                            'content': content,
+                        })
             except Exception as e:
                 print(f"Error reading {file_path}: {e}")
         
@@ -40,14 +40,48 @@ class TokenOptimizer:
         r'wp-content/plugins/hello\.php',
     ]
     
-    def __init__(self):
-        """Initialize token optimizer with tiktoken encoder"""
-        try:
-            # Use cl100k_base encoding (same as GPT-4/Claude)
-            self.encoder = tiktoken.get_encoding("cl100k_base")
-        except Exception:
-            # Fallback to simple estimation if tiktoken fails
-            self.encoder = None
+    # Compiled once and shared by every instance
+    # Skip and core patterns searched in a single pass per path
+    _SKIP_RE = re.compile('|'.join(SKIP_PATTERNS + WP_CORE_PATTERNS), re.IGNORECASE)
+    _THIRD_PARTY_RE = re.compile('|'.join(THIRD_PARTY_INDICATORS), re.IGNORECASE)
+    # String literals are matched (and put back unchanged) so comment
+    # markers inside them, e.g. "http://...", are not stripped. They stop at
+    # a newline, like the old per-line check, so a stray apostrophe in
+    # template HTML ("Don't") can't pair with quotes on later PHP lines.
+    # Line comments end at "?>", as in PHP, so the closing tag is kept.
+    _COMMENT_RE = re.compile(
+        r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+        r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+        r'|/\*[\s\S]*?\*/'
+        r'|(?://|#(?!!))(?:(?!\?>).)*',
+    )
+    # Critical section patterns, one finditer pass per kind. They are kept
+    # apart rather than joined into one alternation: a match of one kind
+    # would otherwise swallow an overlapping section of another kind.
+    _FUNCTION_SIGNATURE_RE = re.compile(r'function\s+\w+\s*\([^)]*\)[^{]*\{')
+    _HOOK_RE = re.compile(r'add_(?:action|filter)\s*\([^;]+;')
+    _DB_QUERY_RE = re.compile(r'(?:\$wpdb->|mysql_|mysqli_)[^;]+;')
+    _USER_INPUT_RE = re.compile(r'\$_(?:GET|POST|REQUEST|COOKIE)[^;]+;')
+    
+    # cl100k_base encoder shared by every instance; loaded on first use.
+    # _encoder_loaded stays True after a failed load, so a missing BPE file
+    # is only attempted once per process.
+    _encoder: Optional[tiktoken.Encoding] = None
+    _encoder_loaded = False
+    
+    @property
+    def encoder(self) -> Optional[tiktoken.Encoding]:
+        """tiktoken encoder, or None if it couldn't be loaded"""
+        cls = type(self)
+        if not cls._encoder_loaded:
+            try:
+                # Use cl100k_base encoding (same as GPT-4/Claude)
+                cls._encoder = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # Fallback to simple estimation if tiktoken fails
+                cls._encoder = None
+            cls._encoder_loaded = True
+        return cls._encoder
     
     def count_tokens(self, text: str) -> int:
         """
@@ -75,19 +109,7 @@ class TokenOptimizer:
         Returns:
             True if file should be skipped
         """
-        path_str = str(file_path)
-        
-        # Check skip patterns
-        for pattern in self.SKIP_PATTERNS:
-            if re.search(pattern, path_str, re.IGNORECASE):
-                return True
-        
-        # Check WordPress core patterns
-        for pattern in self.WP_CORE_PATTERNS:
-            if re.search(pattern, path_str, re.IGNORECASE):
-                return True
-        
-        return False
+        return self._SKIP_RE.search(str(file_path)) is not None
     
     def is_third_party_code(self, content: str) -> bool:
         """
@@ -103,11 +125,7 @@ class TokenOptimizer:
         lines = content.split('\n')[:50]
         header = '\n'.join(lines)
         
-        for pattern in self.THIRD_PARTY_INDICATORS:
-            if re.search(pattern, header, re.IGNORECASE):
-                return True
-        
-        return False
+        return self._THIRD_PARTY_RE.search(header) is not None
     
     def extract_file_patterns(self, content: str) -> Dict[str, Any]:
         """
@@ -212,47 +230,15 @@ class TokenOptimizer:
         Returns:
             Code with comments removed
         """
-        # Remove single-line comments (// and #)
-        # But keep lines with @deprecated
-        lines = []
-        for line in code.split('\n'):
-            if keep_deprecated and '@deprecated' in line.lower():
-                lines.append(line)
-            elif '//' in line:
-                # Check if it's inside a string? (Simple heuristic for now)
-                parts = line.split('//')
-                code_part = parts[0]
-                # If the code part has an odd number of quotes, the // might be inside a string
-                # This is a basic check, a full parser would be better but slower
-                if code_part.count("'") % 2 == 0 and code_part.count('"') % 2 == 0:
-                    if code_part.strip():
-                        lines.append(code_part)
-                else:
-                    lines.append(line)
-            elif '#' in line and not line.strip().startswith('#!'):
-                parts = line.split('#')
-                code_part = parts[0]
-                if code_part.count("'") % 2 == 0 and code_part.count('"') % 2 == 0:
-                    if code_part.strip():
-                        lines.append(code_part)
-                else:
-                    lines.append(line)
-            else:
-                lines.append(line)
-        
-        code = '\n'.join(lines)
-        
-        # Remove multi-line comments /* */
-        # We use a custom function to preserve @deprecated blocks
         def replace_comment(match):
-            comment = match.group(0)
-            if keep_deprecated and '@deprecated' in comment.lower():
-                return comment
+            text = match.group(0)
+            if text[0] in '\'"':
+                return text
+            if keep_deprecated and '@deprecated' in text.lower():
+                return text
             return ''
-            
-        code = re.sub(r'/\*.*?\*/', replace_comment, code, flags=re.DOTALL)
         
-        return code
+        return self._COMMENT_RE.sub(replace_comment, code)
     
     def _collapse_whitespace(self, code: str) -> str:
         """
@@ -264,25 +250,17 @@ class TokenOptimizer:
         Returns:
             Code with collapsed whitespace
         """
-        # First, strip every line to remove trailing/leading spaces where not needed
-        # But we want to preserve indentation? The prompt said "maintain readability"
-        # Actually, for token optimization, indentation is less critical than logic
-        # But let's try to be smart.
-        
-        # Replace multiple newlines (possibly with spaces in between) with double newline
-        code = re.sub(r'\n\s*\n\s*\n+', '\n\n', code)
-        
+        # Blank lines carry no meaning for analysis, so they are dropped;
+        # leading indentation is kept for readability
         lines = []
         for line in code.split('\n'):
-            # Collapse multiple spaces to single space, but preserve leading indentation
             stripped = line.lstrip()
             if not stripped:
                 continue
                 
             indentation = line[:len(line) - len(stripped)]
-            # Collapse spaces inside the line
-            collapsed_content = re.sub(r'[ \t]{2,}', ' ', stripped)
-            lines.append(indentation + collapsed_content)
+            # split()/join() collapses inner runs without the regex engine
+            lines.append(indentation + ' '.join(stripped.split()))
             
         return '\n'.join(lines)
     
@@ -301,29 +279,30 @@ class TokenOptimizer:
         Returns:
             Code with only critical sections
         """
-        critical_sections = []
-        
         # Always include file header (first 10 lines)
         lines = code.split('\n')
-        critical_sections.append('\n'.join(lines[:10]))
+        critical_sections = ['\n'.join(lines[:10])]
         
-        # Extract function signatures (not full bodies)
-        for match in re.finditer(r'(function\s+\w+\s*\([^)]*\)[^{]*\{)', code):
-            critical_sections.append(match.group(1) + '\n    // ... function body ...\n}')
+        # Function signatures (not full bodies)
+        critical_sections.extend(
+            match.group(0) + '\n    // ... function body ...\n}'
+            for match in self._FUNCTION_SIGNATURE_RE.finditer(code)
+        )
         
-        # Extract WordPress hooks (full context needed)
-        for match in re.finditer(r'add_(action|filter)\s*\([^;]+;', code):
-            critical_sections.append(match.group(0))
+        # WordPress hooks (full context needed)
+        critical_sections.extend(match.group(0) for match in self._HOOK_RE.finditer(code))
         
-        # Extract database queries (security critical)
+        # Database queries (security critical)
         if patterns['has_database_queries']:
-            for match in re.finditer(r'(\$wpdb->|mysql_|mysqli_)[^;]+;', code):
-                critical_sections.append(match.group(0))
+            critical_sections.extend(
+                match.group(0) for match in self._DB_QUERY_RE.finditer(code)
+            )
         
-        # Extract user input handling (security critical)
+        # User input handling (security critical)
         if patterns['has_user_input']:
-            for match in re.finditer(r'\$_(GET|POST|REQUEST|COOKIE)[^;]+;', code):
-                critical_sections.append(match.group(0))
+            critical_sections.extend(
+                match.group(0) for match in self._USER_INPUT_RE.finditer(code)
+            )
         
         return '\n\n'.join(critical_sections)
     
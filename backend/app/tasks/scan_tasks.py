@@ -14,6 +14,7 @@ from app.db.session import SessionLocal
 from app.models.scan import Scan, ScanStatus
 from app.models.scan_result import ScanResult
 from app.models.user import User
+from app.services.wordpress.mcp_client import close_mcp_client
 from app.services.wordpress.scanner import WordPressScanner
 from app.services.email import send_scan_complete_email
 
@@ -69,8 +70,10 @@ def run_wordpress_scan(self, scan_id: int) -> dict:
         zip_path = zip_files[0]
         extract_dir.mkdir(parents=True, exist_ok=True)
 
+        # Only PHP sources are scanned, so leave other assets in the archive
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
+            php_members = [name for name in zip_ref.namelist() if name.endswith(".php")]
+            zip_ref.extractall(extract_dir, members=php_members)
 
         # Find PHP files
         php_files = list(extract_dir.rglob("*.php"))
@@ -87,6 +90,7 @@ def run_wordpress_scan(self, scan_id: int) -> dict:
         try:
             issues = loop.run_until_complete(scanner.scan_files(php_files))
         finally:
+            loop.run_until_complete(close_mcp_client())
             loop.close()
 
         # Save results
@@ -15,13 +15,62 @@ from app.db.session import SessionLocal
 from app.models.webhook_config import WebhookConfig
 from app.models.webhook_delivery import WebhookDelivery
 from app.services.webhooks.crypto import get_webhook_crypto
+from app.services.webhooks.circuit_breaker import (
+    get_webhook_circuit_breaker,
+    is_endpoint_failure,
+)
 from app.services.webhooks.templates import slack_template, teams_template
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENCY_TTL_SECONDS = 86400  # 24 hours
+RESPONSE_BODY_LIMIT = 1000  # Stored response body size (bytes)
+
+
+class PrefixedRedis:
+    """
+    Thin Redis wrapper that namespaces keys under a fixed bytes prefix
+
+    The prefix is encoded once, so building a key per call is a single
+    bytes concatenation instead of formatting a new str.
+    """
+    __slots__ = ('_p', '_r')
+
+    def __init__(self, redis_client, prefix: bytes):
+        self._r = redis_client
+        self._p = prefix
+
+    def _key(self, key: str) -> bytes:
+        return self._p + key.encode()
+
+    def exists(self, key: str) -> int:
+        return self._r.exists(self._key(key))
+
+    def setex(self, key: str, ttl: int, value) -> bool:
+        return self._r.setex(self._key(key), ttl, value)
+
 
 class WebhookDeliveryTask(Task):
     """Base task for webhook delivery with error handling"""
+
+    _idempotency_store = None
+    _idempotency_store_ready = False
+
+    @property
+    def idempotency_store(self):
+        """
+        Prefixed Redis store for delivery idempotency keys, or None when the
+        result backend isn't Redis
+
+        Built on first use and reused by every delivery this worker runs.
+        """
+        if not self._idempotency_store_ready:
+            backend = self.app.backend
+            redis_client = backend.client if hasattr(backend, 'client') else None
+            if redis_client:
+                self._idempotency_store = PrefixedRedis(redis_client, b'webhook_delivery:')
+            self._idempotency_store_ready = True
+        return self._idempotency_store
     
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         """Handle task failure"""
@@ -72,6 +121,8 @@ def deliver_webhook(
         Dictionary with delivery status
     """
     db = SessionLocal()
+    circuit_breaker = get_webhook_circuit_breaker()
+    bucket = None
     
     try:
         # Get webhook config and delivery record
@@ -90,12 +141,10 @@ def deliver_webhook(
             raise ValueError(f"Webhook delivery {delivery_id} not found")
         
         # Check idempotency using Redis
-        from app.core.celery_app import celery_app as app
-        redis_client = app.backend.client if hasattr(app.backend, 'client') else None
+        idempotency_store = self.idempotency_store
         
-        if redis_client:
-            idempotency_key = f"webhook_delivery:{delivery_id}"
-            if redis_client.exists(idempotency_key):
+        if idempotency_store:
+            if idempotency_store.exists(delivery_id):
                 logger.info(f"Webhook delivery {delivery_id} already processed (idempotency)")
                 return {"status": "skipped", "reason": "already_processed"}
         
@@ -110,6 +159,16 @@ def deliver_webhook(
             db.commit()
             return {"status": "failed", "error": "decryption_failed"}
         
+        # Fast-fail while the endpoint's circuit is open (no HTTP call)
+        bucket = circuit_breaker.bucket_for(webhook_config.user_id, url)
+        if circuit_breaker.is_open(bucket):
+            logger.warning(f"Webhook delivery {delivery_id} skipped: circuit open for {bucket}")
+            delivery.status = 'failed'
+            delivery.error_message = "Circuit open: endpoint failing repeatedly"
+            delivery.last_attempt_at = datetime.utcnow()
+            db.commit()
+            return {"status": "failed", "error": "circuit_open"}
+        
         # Format message based on webhook type
         formatted_message = _format_message(webhook_config.type, event_type, payload)
         
@@ -132,12 +191,13 @@ def deliver_webhook(
         # Update delivery record: success
         delivery.status = 'delivered'
         delivery.response_code = response.status_code
-        delivery.response_body = response.text[:1000]  # Truncate to 1000 chars
+        # Truncate before decoding so large bodies are never decoded in full
+        delivery.response_body = _truncate_body(response)
         db.commit()
         
         # Set idempotency key in Redis with 24h TTL
-        if redis_client:
-            redis_client.setex(idempotency_key, 86400, "1")
+        if idempotency_store:
+            idempotency_store.setex(delivery_id, IDEMPOTENCY_TTL_SECONDS, "1")
         
         logger.info(f"Webhook delivery {delivery_id} successful")
         
@@ -154,6 +214,13 @@ def deliver_webhook(
         
         logger.warning(f"Webhook delivery {delivery_id} failed (attempt {delivery.attempts}): {exc}")
         
+        # Stop retrying once this failure trips the endpoint's circuit;
+        # 4xx responses are the webhook's own problem and never count
+        if bucket and is_endpoint_failure(exc) and circuit_breaker.record_failure(bucket):
+            delivery.status = 'failed'
+            db.commit()
+            return {"status": "failed", "error": "circuit_open"}
+        
         # Retry with exponential backoff
         try:
             raise self.retry(exc=exc)
@@ -177,6 +244,26 @@ def deliver_webhook(
         db.close()
 
 
+def _truncate_body(response: httpx.Response, limit: int = RESPONSE_BODY_LIMIT) -> str:
+    """
+    Decode at most ``limit`` bytes of a response body
+
+    Slicing the raw bytes through a memoryview avoids decoding (and
+    allocating) the whole body just to keep its first ``limit`` characters.
+    A multi-byte character cut at the boundary decodes as U+FFFD.
+
+    Args:
+        response: HTTP response from the webhook endpoint
+        limit: Maximum number of bytes to keep
+
+    Returns:
+        Truncated body text
+    """
+    return bytes(memoryview(response.content)[:limit]).decode(
+        response.encoding or 'utf-8', errors='replace'
+    )
+
+
 def _format_message(webhook_type: str, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Format message based on webhook type and event type
@@ -2,16 +2,21 @@
 Pytest configuration and shared fixtures
 Provides database, authentication, and mock fixtures for all tests
 """
+import itertools
 import os
 import sys
+from contextvars import ContextVar
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Generator, AsyncGenerator
-from unittest.mock import MagicMock, AsyncMock
+from typing import Generator, AsyncGenerator, Iterable, List
+from unittest.mock import MagicMock, AsyncMock, patch
 
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 # Set test environment variables BEFORE importing app modules
@@ -24,6 +29,7 @@ os.environ["STRIPE_SECRET_KEY"] = "sk_test_fake_stripe_key"
 os.environ["STRIPE_WEBHOOK_SECRET"] = "whsec_test_fake_webhook_secret"
 os.environ["RESEND_API_KEY"] = "re_test_fake_resend_key"
 os.environ["WORDPRESS_MCP_ENABLED"] = "false"
+os.environ["PASSWORD_HASH_COST"] = "4"  # bcrypt minimum; hashes stay valid, just cheap
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -42,11 +48,14 @@ from app.db.session import get_db
 # Database Fixtures
 # ============================================================================
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def engine():
     """
-    Create an in-memory SQLite engine for testing
+    Create an in-memory SQLite engine for the whole test session
     Using StaticPool to share the connection across threads
+
+    Tables are created once; db_session isolates each test in a
+    transaction that is rolled back afterwards.
     """
     engine = create_engine(
         "sqlite:///:memory:",
@@ -54,54 +63,86 @@ def engine():
         poolclass=StaticPool,
     )
 
-    # Enable foreign key constraints for SQLite
     @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
+    def set_sqlite_pragma(dbapi_conn, _connection_record):
+        # Enable foreign key constraints for SQLite
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        # Nothing here needs to survive a crash: keep the rollback journal
+        # and temp tables in memory and never wait on fsync
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+        dbapi_conn.isolation_level = None
 
-    # Create all tables
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Create all tables once
     Base.metadata.create_all(bind=engine)
 
     yield engine
 
-    # Drop all tables after test
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
 
 
+@pytest.fixture(scope="session")
+def connection(engine):
+    """
+    Single connection shared by every test in the session
+    Each test runs inside its own transaction on this connection
+    """
+    connection = engine.connect()
+    yield connection
+    connection.close()
+
+
 @pytest.fixture(scope="function")
-def db_session(engine) -> Generator[Session, None, None]:
+def db_session(connection) -> Generator[Session, None, None]:
     """
     Create a new database session for a test
-    Automatically rolls back after test to maintain isolation
+    The session joins an outer transaction on the shared connection;
+    commits inside the test (including those made by API endpoints through
+    the get_db override) only release SAVEPOINTs, and the outer
+    transaction is rolled back after the test to maintain isolation
     """
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
 
     try:
         yield session
     finally:
-        session.rollback()
         session.close()
+        transaction.rollback()
 
 
-@pytest.fixture(scope="function")
-def client(db_session) -> Generator[TestClient, None, None]:
+# Session the long-lived app client hands to get_db for the current test
+_current_db_session: ContextVar[Session] = ContextVar("current_db_session")
+
+
+def _override_get_db():
+    yield _current_db_session.get()
+
+
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
     """
-    Create a TestClient with database session override
+    Create one TestClient (and app lifespan) for the whole test session
+
+    get_db is overridden to yield whichever session the per-test client
+    fixture has bound, so requests still run inside that test's transaction.
     """
     from app.main import app
 
-    # Override the get_db dependency
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db] = _override_get_db
 
     with TestClient(app) as test_client:
         yield test_client
@@ -110,68 +151,215 @@ def client(db_session) -> Generator[TestClient, None, None]:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def _bound_db_session(db_session) -> Generator[Session, None, None]:
+    """
+    Make this test's database session the one get_db yields to requests
+
+    Requested by the client fixtures only for that side effect.
+    """
+    token = _current_db_session.set(db_session)
+    try:
+        yield db_session
+    finally:
+        _current_db_session.reset(token)
+
+
+@pytest.fixture(scope="function")
+def client(app_client, _bound_db_session) -> Generator[TestClient, None, None]:
+    """
+    Bind the shared TestClient to this test's database session
+    """
+    try:
+        yield app_client
+    finally:
+        app_client.cookies.clear()
+
+
+@pytest.fixture(scope="function")
+async def async_client(_bound_db_session) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Async client that calls the app in-process, bound to this test's session
+
+    ASGITransport never runs the app lifespan, so tests that don't need
+    startup (Redis, MCP client) skip it and the TestClient portal thread.
+    """
+    from app.main import app
+
+    app.dependency_overrides[get_db] = _override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+_stdlib_response_json = httpx.Response.json
+
+
+def _orjson_response_json(self: httpx.Response, **kwargs):
+    """Response.json() backed by orjson; keyword options fall back to stdlib json"""
+    if kwargs:
+        return _stdlib_response_json(self, **kwargs)
+    return orjson.loads(self.content)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _orjson_responses() -> Generator[None, None, None]:
+    """Parse response bodies in tests with orjson instead of the json module"""
+    with patch.object(httpx.Response, "json", _orjson_response_json):
+        yield
+
+
 # ============================================================================
 # User Factories and Fixtures
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def hash_test_password(password: str) -> str:
+    """
+    bcrypt-hash a test password once per session
+
+    Factory users share a handful of passwords, so reusing the hash drops
+    repeated bcrypt rounds from fixture setup while login tests still
+    verify against a real hash.
+    """
+    return get_password_hash(password)
+
+
+@pytest.fixture(scope="session")
+def hashed_password():
+    """
+    Look up the session-cached hash for a password
+
+    For tests that need a valid bcrypt hash but aren't testing hashing
+    itself; salt and freshness tests should call get_password_hash.
+    """
+    return hash_test_password
+
+
+def _commit_all(db: Session, objs: list) -> list:
+    """Add objects and commit them in one transaction"""
+    db.add_all(objs)
+    db.commit()
+    for obj in objs:
+        db.refresh(obj)
+    return objs
+
+
 class UserFactory:
     """Factory for creating test users"""
 
     @staticmethod
-    def create(
-        db: Session,
+    def _new(
         email: str = "test@example.com",
         password: str = "TestPass123!",
         name: str = "Test User",
         company: str = None,
         is_verified: bool = True,
         onboarding_completed: bool = True,
+        hashed_password: str = None,
         **kwargs
     ) -> User:
-        """Create a user in the database"""
-        user = User(
+        """
+        Instantiate a user with factory defaults
+
+        A precomputed hashed_password skips hashing entirely; otherwise the
+        session-wide hash for password is reused.
+        """
+        return User(
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=hashed_password or hash_test_password(password),
             name=name,
             company=company,
             is_verified=is_verified,
             onboarding_completed=onboarding_completed,
             **kwargs
         )
+
+    @staticmethod
+    def create(db: Session, **kwargs) -> User:
+        """Create a user in the database"""
+        user = UserFactory._new(**kwargs)
         db.add(user)
         db.commit()
         db.refresh(user)
         return user
 
+    @staticmethod
+    def create_many(db: Session, items: Iterable[dict], **common) -> List[User]:
+        """
+        Create several users with a single commit
+
+        Each item holds per-user overrides (e.g. a distinct email) applied
+        on top of the shared keyword arguments.
+        """
+        users = [UserFactory._new(**{**common, **item}) for item in items]
+        return _commit_all(db, users)
+
+    _build_ids = itertools.count(1)
+
     @staticmethod
     def build(**kwargs) -> User:
-        """Build a user without saving to database"""
+        """
+        Build a user without saving to database
+
+        Built users get a unique id and zeroed lockout state so tests that
+        only read attributes back never touch the session.
+        """
         defaults = {
+            "id": next(UserFactory._build_ids),
             "email": "test@example.com",
-            "hashed_password": get_password_hash("TestPass123!"),
+            "hashed_password": hash_test_password("TestPass123!"),
             "name": "Test User",
             "is_verified": True,
             "onboarding_completed": True,
+            "failed_login_attempts": 0,
         }
         defaults.update(kwargs)
         return User(**defaults)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user_factory():
     """Provide UserFactory to tests"""
     return UserFactory
 
 
+@pytest.fixture(scope="session")
+def seed_baseline(connection) -> dict:
+    """
+    Insert rows most tests share once per session
+
+    The rows are committed on the shared connection before any per-test
+    transaction opens, so every test sees them and whatever a test changes
+    is rolled back with the rest of its transaction.
+    """
+    with Session(bind=connection) as session:
+        user = UserFactory._new(
+            email="testuser@example.com",
+            password="ValidPass123!",
+            name="Test User"
+        )
+        locked = UserFactory._new(
+            email="locked@example.com",
+            password="ValidPass123!",
+            name="Locked User",
+            failed_login_attempts=5,
+            locked_until=datetime.utcnow() + timedelta(minutes=30),
+            last_failed_login=datetime.utcnow()
+        )
+        session.add_all([user, locked])
+        session.commit()
+        return {
+            "test_user_id": user.id,
+            "test_user_email": user.email,
+            "locked_user_id": locked.id,
+        }
+
+
 @pytest.fixture
-def test_user(db_session) -> User:
-    """Create a standard test user"""
-    return UserFactory.create(
-        db_session,
-        email="testuser@example.com",
-        password="ValidPass123!",
-        name="Test User"
-    )
+def test_user(db_session, seed_baseline) -> User:
+    """Standard test user, seeded once per session"""
+    return db_session.get(User, seed_baseline["test_user_id"])
 
 
 @pytest.fixture
@@ -199,17 +387,9 @@ def unverified_user(db_session) -> User:
 
 
 @pytest.fixture
-def locked_user(db_session) -> User:
-    """Create a locked-out test user"""
-    return UserFactory.create(
-        db_session,
-        email="locked@example.com",
-        password="ValidPass123!",
-        name="Locked User",
-        failed_login_attempts=5,
-        locked_until=datetime.utcnow() + timedelta(minutes=30),
-        last_failed_login=datetime.utcnow()
-    )
+def locked_user(db_session, seed_baseline) -> User:
+    """Locked-out test user (locked for 30 minutes), seeded once per session"""
+    return db_session.get(User, seed_baseline["locked_user_id"])
 
 
 # ============================================================================
@@ -239,6 +419,18 @@ class SiteFactory:
         db.refresh(site)
         return site
 
+    @staticmethod
+    def create_many(
+        db: Session, user: User, items: Iterable[dict], **common
+    ) -> List[Site]:
+        """Create several sites for a user with a single commit"""
+        defaults = {"url": "https://example.com", "name": "Test Site"}
+        sites = [
+            Site(user_id=user.id, **{**defaults, **common, **item})
+            for item in items
+        ]
+        return _commit_all(db, sites)
+
 
 class ScanFactory:
     """Factory for creating test scans"""
@@ -263,14 +455,29 @@ class ScanFactory:
         db.refresh(scan)
         return scan
 
-
-@pytest.fixture
+    @staticmethod
+    def create_many(
+        db: Session, user: User, items: Iterable[dict], site: Site = None, **common
+    ) -> List[Scan]:
+        """Create several scans for a user with a single commit"""
+        scans = [
+            Scan(
+                user_id=user.id,
+                site_id=site.id if site else None,
+                **{"status": "pending", **common, **item}
+            )
+            for item in items
+        ]
+        return _commit_all(db, scans)
+
+
+@pytest.fixture(scope="session")
 def site_factory():
     """Provide SiteFactory to tests"""
     return SiteFactory
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def scan_factory():
     """Provide ScanFactory to tests"""
     return ScanFactory
@@ -302,10 +509,18 @@ def test_scan(db_session, test_user, test_site) -> Scan:
 # Authentication Fixtures
 # ============================================================================
 
-@pytest.fixture
-def test_token(test_user) -> str:
-    """Create a valid JWT token for test user"""
-    return create_access_token(data={"sub": test_user.email})
+@pytest.fixture(scope="session")
+def test_token(seed_baseline) -> str:
+    """
+    Create a valid JWT token for the seeded test user, once per session
+
+    Minted with a lifetime well beyond any test run rather than the default
+    ACCESS_TOKEN_EXPIRE_MINUTES, so it can't expire mid-session.
+    """
+    return create_access_token(
+        data={"sub": seed_baseline["test_user_email"]},
+        expires_delta=timedelta(hours=12)
+    )
 
 
 @pytest.fixture
@@ -323,7 +538,7 @@ def expired_token() -> str:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers(test_token) -> dict:
     """Create authorization headers with valid token"""
     return {"Authorization": f"Bearer {test_token}"}
@@ -374,15 +589,21 @@ def mock_stripe(mocker):
     return mock_stripe
 
 
-@pytest.fixture
-def mock_resend(mocker):
-    """Mock Resend email service"""
-    mock_resend = MagicMock()
-    mock_response = {"id": "email_test_123"}
-    mock_resend.Emails.send.return_value = mock_response
+@pytest.fixture(scope="session", autouse=True)
+def _disable_resend() -> Generator[MagicMock, None, None]:
+    """Replace the Resend SDK with a null object for the whole session"""
+    null_resend = MagicMock()
+    null_resend.Emails.send.return_value = {"id": "email_test_123"}
 
-    mocker.patch("app.services.email.resend", mock_resend)
-    return mock_resend
+    with patch("app.services.email.notifications.resend", null_resend):
+        yield null_resend
+
+
+@pytest.fixture
+def mock_resend(_disable_resend) -> MagicMock:
+    """Session Resend mock with calls from earlier tests cleared, for asserting sends"""
+    _disable_resend.reset_mock()
+    return _disable_resend
 
 
 @pytest.fixture
@@ -478,6 +699,13 @@ def reset_rate_limits():
         limiter._storage.reset()
 
 
+@pytest.fixture(autouse=True)
+def reset_scan_limit_cache():
+    """Forget users cached as over their daily scan limit between tests"""
+    from app.api.dependencies import clear_scan_limit_cache
+    clear_scan_limit_cache()
+
+
 @pytest.fixture
 def test_settings():
     """Provide test settings"""
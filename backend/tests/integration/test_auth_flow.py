@@ -2,10 +2,31 @@
 Integration tests for complete authentication workflows
 Tests the entire user journey from registration to authenticated actions
 """
+import uuid
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi import status
 
 
+@pytest.fixture(
+    params=[("valid", timedelta(hours=1)), ("expired", timedelta(hours=-1))],
+    ids=["valid", "expired"],
+)
+def reset_user(request, db_session, user_factory):
+    """User holding a password reset token that is either valid or expired"""
+    label, expires_in = request.param
+    reset_token = uuid.uuid4().hex
+    user = user_factory.create(
+        db_session,
+        email=f"reset-{label}@example.com",
+        password="OldPassword123!",
+        reset_token=reset_token,
+        reset_token_expires=datetime.utcnow() + expires_in
+    )
+    return user, reset_token, label == "valid"
+
+
 class TestCompleteAuthFlow:
     """Test complete authentication user journey"""
 
@@ -88,7 +109,7 @@ class TestCompleteAuthFlow:
 class TestPasswordResetFlow:
     """Test complete password reset workflow"""
 
-    def test_forgot_password_request(self, client, test_user, mock_resend):
+    def test_forgot_password_request(self, client, test_user):
         """Test password reset request sends email"""
         reset_request = {"email": test_user.email}
         response = client.post("/api/v1/auth/forgot-password", json=reset_request)
@@ -105,20 +126,9 @@ class TestPasswordResetFlow:
         assert response.status_code == status.HTTP_200_OK
         assert "reset link" in response.json()["message"].lower()
 
-    def test_reset_password_with_valid_token(self, client, db_session, user_factory):
-        """Test complete password reset with valid token"""
-        from datetime import datetime, timedelta
-        import uuid
-
-        # Create user with reset token
-        reset_token = str(uuid.uuid4())
-        user = user_factory.create(
-            db_session,
-            email="resettest@example.com",
-            password="OldPassword123!",
-            reset_token=reset_token,
-            reset_token_expires=datetime.utcnow() + timedelta(hours=1)
-        )
+    def test_reset_password_with_token(self, client, reset_user):
+        """Test password reset succeeds with a valid token and fails with an expired one"""
+        user, reset_token, valid = reset_user
 
         # Reset password
         reset_data = {
@@ -126,6 +136,10 @@ class TestPasswordResetFlow:
             "new_password": "NewSecurePass123!"
         }
         response = client.post("/api/v1/auth/reset-password", json=reset_data)
+
+        if not valid:
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            return
         assert response.status_code == status.HTTP_200_OK
 
         # Verify can login with new password
@@ -133,27 +147,6 @@ class TestPasswordResetFlow:
         login_response = client.post("/api/v1/auth/login", json=login_data)
         assert login_response.status_code == status.HTTP_200_OK
 
-    def test_reset_password_with_expired_token(self, client, db_session, user_factory):
-        """Test password reset with expired token fails"""
-        from datetime import datetime, timedelta
-        import uuid
-
-        reset_token = str(uuid.uuid4())
-        user_factory.create(
-            db_session,
-            email="expiredtoken@example.com",
-            password="OldPassword123!",
-            reset_token=reset_token,
-            reset_token_expires=datetime.utcnow() - timedelta(hours=1)  # Expired
-        )
-
-        reset_data = {
-            "token": reset_token,
-            "new_password": "NewPassword123!"
-        }
-        response = client.post("/api/v1/auth/reset-password", json=reset_data)
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
-
     def test_reset_password_with_invalid_token(self, client):
         """Test password reset with invalid token fails"""
         reset_data = {
@@ -216,11 +209,8 @@ class TestPasswordChangeFlow:
 class TestAccountLockoutRecoveryFlow:
     """Test account lockout and recovery workflow"""
 
-    def test_lockout_then_password_reset_unlocks(self, client, db_session, user_factory, mock_resend):
+    def test_lockout_then_password_reset_unlocks(self, client, db_session, user_factory):
         """Test that password reset unlocks a locked account"""
-        from datetime import datetime, timedelta
-        import uuid
-
         # Create locked user
         user = user_factory.create(
             db_session,
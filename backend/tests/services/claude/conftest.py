@@ -0,0 +1,44 @@
+"""
+Shared fixtures for Claude client tests
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services.claude.client import close_claude_clients
+
+# Pre-built tool_use reply, shared by every test that uses anthropic_stub
+TOOL_USE_RESPONSE = SimpleNamespace(
+    content=[
+        SimpleNamespace(
+            type="tool_use",
+            name="report_compatibility_issues",
+            input={"risk_level": "safe", "summary": "No issues", "issues": []},
+        )
+    ]
+)
+
+
+@pytest.fixture(scope="module")
+def anthropic_stub():
+    """
+    Patch anthropic.Anthropic once per module
+
+    Every ClaudeClient built while the patch is active gets the same stubbed
+    SDK client, whose messages.create returns TOOL_USE_RESPONSE. Shared SDK
+    clients are dropped on both sides so none outlive the patch.
+    """
+    close_claude_clients()
+    with patch("app.services.claude.client.anthropic.Anthropic") as anthropic_cls:
+        anthropic_cls.return_value.messages.create.return_value = TOOL_USE_RESPONSE
+        yield anthropic_cls
+    close_claude_clients()
+
+
+@pytest.fixture
+def claude_messages(anthropic_stub):
+    """Stubbed messages.create with call history from earlier tests cleared"""
+    create = anthropic_stub.return_value.messages.create
+    create.reset_mock()
+    return create
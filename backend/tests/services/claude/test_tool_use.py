@@ -2,31 +2,16 @@
 Unit tests for Tool Use Integration
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 from app.services.claude.client import ClaudeClient
 from app.services.wordpress.scanner import WordPressScanner
 
 
 @pytest.mark.asyncio
-async def test_analyze_code_batch_with_tool():
+async def test_analyze_code_batch_with_tool(claude_messages):
     """Test that client calls API with correct tool parameters"""
     client = ClaudeClient(api_key="test_key")
-    client.client = MagicMock()
-    client.client.messages.create = MagicMock()
-    
-    # Mock response
-    mock_response = MagicMock()
-    mock_content = MagicMock()
-    mock_content.type = "tool_use"
-    mock_content.name = "report_compatibility_issues"
-    mock_content.input = {
-        "risk_level": "safe",
-        "summary": "No issues",
-        "issues": []
-    }
-    mock_response.content = [mock_content]
-    client.client.messages.create.return_value = mock_response
-    
+
     files = [{"filename": "test.php", "content": "<?php echo 'test'; ?>"}]
     result = await client.analyze_code_batch_with_tool(files, "5.0", "6.0")
     
@@ -34,7 +19,7 @@ async def test_analyze_code_batch_with_tool():
     assert result["risk_level"] == "safe"
     
     # Verify API call
-    call_args = client.client.messages.create.call_args
+    call_args = claude_messages.call_args
     assert call_args is not None
     kwargs = call_args[1]
     
@@ -28,5 +28,13 @@ def test_get_compatibility_analysis_tool():
     assert 'info' in severity_enum
 
 
+def test_get_compatibility_analysis_tool_is_shared():
+    """Test that the tool definition is built once and its enums are immutable"""
+    tool = get_compatibility_analysis_tool()
+
+    assert get_compatibility_analysis_tool() is tool
+    assert isinstance(tool['input_schema']['properties']['risk_level']['enum'], tuple)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
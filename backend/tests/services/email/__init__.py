@@ -0,0 +1 @@
+# Email tests
@@ -0,0 +1,25 @@
+"""
+Tests for transactional email notifications
+"""
+from app.services.email import send_scan_complete_email
+
+
+def test_send_scan_complete_email_includes_risk_and_issue_count(mocker):
+    """Test that the scan summary email shows the risk level and issue count"""
+    send = mocker.patch(
+        "app.services.email.notifications.send_email", return_value={"id": "test_email_id"}
+    )
+
+    response = send_scan_complete_email(
+        email_to="test@example.com",
+        scan_id=123,
+        risk_level="critical",
+        issue_count=42
+    )
+
+    assert response == {"id": "test_email_id"}
+    email_to, subject, html_content = send.call_args.args
+    assert email_to == "test@example.com"
+    assert "42" in subject
+    assert "CRITICAL" in html_content or "Critical" in html_content
+    assert "42" in html_content
@@ -0,0 +1 @@
+# Reporting tests
@@ -0,0 +1,67 @@
+"""
+Tests for the rendered PDF report cache
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.scan import RiskLevel
+from app.services.reporting import pdf_generator
+from app.services.reporting.pdf_generator import PDFReportGenerator, clear_report_cache
+
+
+@pytest.fixture
+def scan():
+    """A scan with one finding, shaped like the ORM object the report reads"""
+    result = SimpleNamespace(
+        severity="critical",
+        issue_type="security_vulnerability",
+        file_path="/wp-content/plugins/unsafe.php",
+        description="SQL Injection vulnerability found",
+    )
+    return SimpleNamespace(
+        id=123,
+        site=SimpleNamespace(url="https://example.com"),
+        created_at=datetime(2024, 1, 1, 12, 0),
+        wordpress_version_from="5.0",
+        wordpress_version_to="6.0",
+        risk_level=RiskLevel.HIGH,
+        results=[result],
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_report_cache()
+    yield
+    clear_report_cache()
+
+
+def test_generate_reuses_render_for_unchanged_scan(scan, mocker):
+    """Test that a repeat download skips rendering"""
+    render = mocker.spy(PDFReportGenerator, "generate_to_stream")
+
+    first = PDFReportGenerator(scan).generate()
+    second = PDFReportGenerator(scan).generate()
+
+    assert first.startswith(b"%PDF")
+    assert second is first
+    assert render.call_count == 1
+
+
+def test_generate_renders_again_when_results_change(scan, mocker):
+    """Test that new findings produce a fresh report"""
+    render = mocker.spy(PDFReportGenerator, "generate_to_stream")
+    PDFReportGenerator(scan).generate()
+
+    scan.results.append(SimpleNamespace(
+        severity="medium",
+        issue_type="deprecated_function",
+        file_path="/wp-content/themes/old/functions.php",
+        description="create_function() is deprecated",
+    ))
+    PDFReportGenerator(scan).generate()
+
+    assert render.call_count == 2
+    assert len(pdf_generator._report_cache) == 2
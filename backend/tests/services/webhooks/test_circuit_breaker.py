@@ -0,0 +1,278 @@
+"""
+Tests for the webhook delivery circuit breaker
+"""
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import redis
+from fastapi import status
+
+from app.core.celery_app import celery_app
+from app.core.security import create_access_token
+from app.models.webhook_config import WebhookConfig
+from app.models.webhook_delivery import WebhookDelivery
+from app.services.webhooks import circuit_breaker as cb_module
+from app.services.webhooks.circuit_breaker import (
+    WebhookCircuitBreaker,
+    is_endpoint_failure,
+)
+from app.tasks.webhook_tasks import deliver_webhook
+
+WEBHOOK_URL = "https://hooks.slack.com/services/T000/B000/XXXX"
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands the breaker uses"""
+
+    def __init__(self):
+        self.store = {}
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    def expire(self, key, _seconds):
+        return key in self.store
+
+    def setex(self, key, _seconds, value):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def incr(self, key):
+        self.commands.append(lambda: self.client.incr(key))
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: self.client.expire(key, seconds))
+
+    def execute(self):
+        return [command() for command in self.commands]
+
+
+class FailingRedis(FakeRedis):
+    """Redis whose writes fail as during an outage"""
+
+    def delete(self, *_keys):
+        raise redis.ConnectionError("Redis unavailable")
+
+
+@pytest.fixture
+def breaker(mocker):
+    """Circuit breaker over in-memory Redis, used by task and endpoint"""
+    breaker = WebhookCircuitBreaker(
+        FakeRedis(), failure_threshold=2, window_seconds=60, open_seconds=300
+    )
+    mocker.patch.object(cb_module, "_circuit_breaker_instance", breaker)
+    return breaker
+
+
+@pytest.fixture
+def mock_crypto(mocker):
+    """Webhook crypto that stores URLs as-is"""
+    crypto = mocker.MagicMock()
+    crypto.encrypt_url.side_effect = lambda url: url
+    crypto.decrypt_url.side_effect = lambda url: url
+    crypto.mask_url.side_effect = lambda url: url
+    mocker.patch("app.tasks.webhook_tasks.get_webhook_crypto", return_value=crypto)
+    mocker.patch("app.api.v1.endpoints.webhooks.get_webhook_crypto", return_value=crypto)
+    return crypto
+
+
+@pytest.fixture
+def task_db(mocker, db_session):
+    """Run deliver_webhook against the test session without a result backend"""
+    mocker.patch("app.tasks.webhook_tasks.SessionLocal", return_value=db_session)
+    mocker.patch.object(type(celery_app), "backend", SimpleNamespace())
+    mocker.patch.object(deliver_webhook, "_idempotency_store_ready", False)
+    return db_session
+
+
+@pytest.fixture
+def delivery(db_session, test_user):
+    """A pending delivery for a Slack webhook owned by test_user"""
+    webhook = WebhookConfig(
+        id=str(uuid.uuid4()),
+        user_id=str(test_user.id),
+        name="Slack alerts",
+        type="http",
+        url=WEBHOOK_URL,
+        enabled=True,
+        events=["scan_completed"],
+    )
+    delivery = WebhookDelivery(
+        id=str(uuid.uuid4()),
+        webhook_config_id=webhook.id,
+        event_type="scan_completed",
+        payload={"scan_id": "1"},
+        status="pending",
+        attempts=0,
+    )
+    db_session.add_all([webhook, delivery])
+    db_session.commit()
+    # deliver_webhook closes its session, so hand tests plain ids rather
+    # than instances that would become detached
+    return SimpleNamespace(
+        id=delivery.id, webhook_config_id=webhook.id, user_id=test_user.id
+    )
+
+
+def _run(delivery):
+    return deliver_webhook(
+        delivery_id=delivery.id,
+        webhook_config_id=delivery.webhook_config_id,
+        event_type="scan_completed",
+        payload={"scan_id": "1"},
+    )
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", WEBHOOK_URL)
+    response = httpx.Response(code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestEndpointFailureClassification:
+    """Only unhealthy-endpoint errors count against the circuit"""
+
+    @pytest.mark.parametrize("exc,expected", [
+        (httpx.ConnectTimeout("timeout"), True),
+        (httpx.ConnectError("refused"), True),
+        (_status_error(503), True),
+        (_status_error(404), False),
+        (_status_error(410), False),
+    ])
+    def test_is_endpoint_failure(self, exc, expected):
+        """Test that transport errors and 5xx count, 4xx does not"""
+        assert is_endpoint_failure(exc) is expected
+
+
+class TestDeliverWebhookCircuit:
+    """Circuit breaker behaviour inside deliver_webhook"""
+
+    @pytest.mark.usefixtures("mock_crypto")
+    def test_open_circuit_fast_fails_without_http_call(self, mocker, breaker, task_db, delivery):
+        """Test that an open circuit marks the delivery failed and skips HTTP"""
+        post = mocker.patch("app.tasks.webhook_tasks.httpx.post")
+        bucket = WebhookCircuitBreaker.bucket_for(delivery.user_id, WEBHOOK_URL)
+        breaker.redis.setex(f"cb:{bucket}:open", 300, "1")
+
+        result = _run(delivery)
+
+        assert result == {"status": "failed", "error": "circuit_open"}
+        post.assert_not_called()
+        record = task_db.get(WebhookDelivery, delivery.id)
+        assert record.status == "failed"
+        assert record.attempts == 0
+
+    @pytest.mark.usefixtures("breaker", "mock_crypto")
+    def test_retries_stop_once_circuit_opens(self, mocker, task_db, delivery):
+        """Test that failures retry until the threshold, then fail without retrying"""
+        post = mocker.patch(
+            "app.tasks.webhook_tasks.httpx.post", side_effect=httpx.ConnectError("refused")
+        )
+
+        # First failure is below the threshold: the task retries (re-raises
+        # when called directly)
+        with pytest.raises(httpx.ConnectError):
+            _run(delivery)
+
+        # Second failure opens the circuit: no retry, delivery failed
+        result = _run(delivery)
+        assert result == {"status": "failed", "error": "circuit_open"}
+        assert task_db.get(WebhookDelivery, delivery.id).status == "failed"
+
+        # Further deliveries fast-fail without touching the endpoint
+        assert _run(delivery) == {"status": "failed", "error": "circuit_open"}
+        assert post.call_count == 2
+
+    @pytest.mark.usefixtures("mock_crypto", "task_db")
+    def test_client_errors_do_not_open_circuit(self, mocker, breaker, delivery):
+        """Test that 4xx responses never trip the circuit"""
+        response = mocker.MagicMock()
+        response.raise_for_status.side_effect = _status_error(404)
+        mocker.patch("app.tasks.webhook_tasks.httpx.post", return_value=response)
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                _run(delivery)
+
+        bucket = WebhookCircuitBreaker.bucket_for(delivery.user_id, WEBHOOK_URL)
+        assert not breaker.is_open(bucket)
+        assert breaker.redis.store == {}
+
+    def test_circuit_is_scoped_per_user(self, breaker):
+        """Test that one user's open circuit does not affect another on the same host"""
+        bucket_a = WebhookCircuitBreaker.bucket_for(1, WEBHOOK_URL)
+        bucket_b = WebhookCircuitBreaker.bucket_for(2, WEBHOOK_URL)
+
+        breaker.record_failure(bucket_a)
+        breaker.record_failure(bucket_a)
+
+        assert breaker.is_open(bucket_a)
+        assert not breaker.is_open(bucket_b)
+
+
+class TestResetCircuitEndpoint:
+    """POST /webhooks/{id}/reset-circuit"""
+
+    @pytest.fixture
+    def headers(self, test_user):
+        token = create_access_token(data={"user_id": test_user.id, "email": test_user.email})
+        return {"Authorization": f"Bearer {token}"}
+
+    @pytest.mark.usefixtures("mock_crypto")
+    def test_reset_closes_owner_circuit(self, client, breaker, delivery, headers):
+        """Test that the owner can close their own circuit"""
+        bucket = WebhookCircuitBreaker.bucket_for(delivery.user_id, WEBHOOK_URL)
+        breaker.redis.setex(f"cb:{bucket}:open", 300, "1")
+
+        response = client.post(
+            f"/api/v1/webhooks/{delivery.webhook_config_id}/reset-circuit", headers=headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"host": "hooks.slack.com", "reset": True}
+        assert not breaker.is_open(bucket)
+
+    @pytest.mark.usefixtures("breaker", "mock_crypto")
+    def test_reset_other_users_webhook_not_found(self, client, delivery, db_session, user_factory):
+        """Test that users cannot reset circuits for webhooks they don't own"""
+        other = user_factory.create(db_session, email="other@example.com")
+        token = create_access_token(data={"user_id": other.id, "email": other.email})
+
+        response = client.post(
+            f"/api/v1/webhooks/{delivery.webhook_config_id}/reset-circuit",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.usefixtures("mock_crypto")
+    def test_reset_redis_outage_returns_503(self, client, mocker, delivery, headers):
+        """Test that a Redis outage maps to 503 instead of an unhandled error"""
+        mocker.patch.object(
+            cb_module, "_circuit_breaker_instance", WebhookCircuitBreaker(FailingRedis())
+        )
+
+        response = client.post(
+            f"/api/v1/webhooks/{delivery.webhook_config_id}/reset-circuit", headers=headers
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,56 @@
+"""
+Unit tests for webhook delivery task helpers
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+
+from app.core.celery_app import celery_app
+from app.tasks.webhook_tasks import PrefixedRedis, _truncate_body, deliver_webhook
+
+
+def test_prefixed_redis_namespaces_keys():
+    """Test that keys are prefixed before reaching Redis"""
+    redis_client = MagicMock()
+    store = PrefixedRedis(redis_client, b"webhook_delivery:")
+
+    store.exists("abc-123")
+    store.setex("abc-123", 60, "1")
+
+    redis_client.exists.assert_called_once_with(b"webhook_delivery:abc-123")
+    redis_client.setex.assert_called_once_with(b"webhook_delivery:abc-123", 60, "1")
+
+
+def test_prefixed_redis_key_matches_legacy_format():
+    """Test that prefixed keys match the previous str keys so existing entries still dedupe"""
+    store = PrefixedRedis(MagicMock(), b"webhook_delivery:")
+
+    assert store._key("abc-123") == "webhook_delivery:abc-123".encode()
+
+
+def test_idempotency_store_built_once(mocker):
+    """Test that the task builds its Redis store once and reuses it"""
+    redis_client = MagicMock()
+    mocker.patch.object(type(celery_app), "backend", SimpleNamespace(client=redis_client))
+    mocker.patch.object(deliver_webhook, "_idempotency_store_ready", False)
+    mocker.patch.object(deliver_webhook, "_idempotency_store", None)
+
+    store = deliver_webhook.idempotency_store
+
+    assert isinstance(store, PrefixedRedis)
+    assert deliver_webhook.idempotency_store is store
+
+
+def test_truncate_body_limits_bytes():
+    """Test that only the first 1000 bytes of a response body are kept"""
+    response = httpx.Response(200, content=b"x" * 5000)
+
+    assert _truncate_body(response) == "x" * 1000
+
+
+def test_truncate_body_replaces_split_multibyte_char():
+    """Test that a character cut at the byte limit decodes without raising"""
+    response = httpx.Response(200, content="é".encode() * 2, headers={"Content-Type": "text/plain; charset=utf-8"})
+
+    assert _truncate_body(response, limit=3) == "é�"
@@ -6,13 +6,13 @@ from pathlib import Path
 from app.services.wordpress.analyzer import WordPressAnalyzer
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def analyzer():
-    """Create analyzer instance"""
+    """Create analyzer instance, shared by the module (it holds no mutable state)"""
     return WordPressAnalyzer()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_code():
     """Sample PHP code with issues"""
     return """
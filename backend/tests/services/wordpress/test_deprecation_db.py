@@ -1,6 +1,8 @@
 """
 Unit tests for WordPress deprecation database
 """
+import dataclasses
+
 import pytest
 from app.services.wordpress.deprecation_db import WordPressDeprecationDB, ChangeType
 
@@ -37,6 +39,16 @@ def test_get_deprecated_in_range():
     assert len(get_page_items) > 0
 
 
+def test_get_deprecated_in_range_no_duplicates():
+    """Test that items deprecated and removed inside the range appear once"""
+    db = WordPressDeprecationDB()
+
+    # $.load is deprecated in 5.5 and removed in 5.9
+    items = db.get_deprecated_in_range('5.0', '6.0')
+
+    assert [i.name for i in items].count('$.load') == 1
+
+
 def test_get_critical_changes():
     """Test getting critical changes"""
     db = WordPressDeprecationDB()
@@ -74,5 +86,14 @@ def test_get_replacement_suggestion():
     assert replacement is None
 
 
+def test_deprecated_item_is_immutable():
+    """Test that shared DeprecatedItem instances cannot be mutated"""
+    item = WordPressDeprecationDB().check_function('get_page')
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        item.replacement = 'something_else'
+    assert not hasattr(item, '__dict__')
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -1,11 +1,24 @@
 """
 Unit tests for Hybrid Deprecation DB
 """
+import httpx
 import pytest
+import respx
 from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.wordpress import hybrid_deprecation_db as hybrid_module
 from app.services.wordpress.hybrid_deprecation_db import HybridDeprecationDB
 from app.services.wordpress.deprecation_db import DeprecatedItem, ChangeType
 
+MCP_URL = "https://api.test.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_hybrid_cache():
+    """The range cache is process-wide; start every test cold"""
+    HybridDeprecationDB.invalidate()
+    yield
+    HybridDeprecationDB.invalidate()
+
 
 @pytest.mark.asyncio
 async def test_hybrid_get_deprecations():
@@ -63,11 +76,14 @@ async def test_hybrid_get_deprecations():
 
 @pytest.mark.asyncio
 async def test_hybrid_fallback_on_error():
-    """Test fallback to local data when MCP fails"""
-    with patch("app.services.wordpress.hybrid_deprecation_db.WordPressMCPClient") as MockClient:
-        mock_client = MockClient.return_value
-        mock_client.get_deprecations = AsyncMock(side_effect=Exception("MCP Down"))
-        
+    """Test fallback to local data when the MCP server is unreachable"""
+    with patch("app.services.wordpress.mcp_client.settings") as mcp_settings, \
+         respx.mock(base_url=MCP_URL) as router:
+        mcp_settings.WORDPRESS_MCP_URL = MCP_URL
+        mcp_settings.WORDPRESS_MCP_API_KEY = ""
+        mcp_settings.WORDPRESS_MCP_ENABLED = True
+        route = router.get("/deprecations").mock(side_effect=httpx.ConnectError("MCP Down"))
+
         db = HybridDeprecationDB()
         
         # Mock local data
@@ -87,3 +103,33 @@ async def test_hybrid_fallback_on_error():
             
             assert len(items) == 1
             assert items[0].name == "local_func"
+
+            # The fallback is cached briefly, so a down server isn't hit again,
+            # and never lands in the long-lived range cache
+            await db.get_deprecated_in_range_async("5.0", "6.0")
+            assert route.call_count == 1
+            assert "range:5.0:6.0" not in db.cache
+            assert "range:5.0:6.0" in hybrid_module._fallback_cache
+
+
+@pytest.mark.asyncio
+async def test_sync_lookup_uses_async_cache():
+    """Test that sync callers get merged results once the async path cached them"""
+    with patch("app.services.wordpress.hybrid_deprecation_db.WordPressMCPClient") as MockClient:
+        mcp_item = DeprecatedItem(
+            name="mcp_func",
+            deprecated_in="6.0",
+            removed_in=None,
+            replacement="new_func",
+            change_type=ChangeType.DEPRECATED_FUNCTION,
+            severity="medium",
+            description="MCP deprecation"
+        )
+        MockClient.return_value.get_deprecations = AsyncMock(return_value=[mcp_item])
+
+        await HybridDeprecationDB().get_deprecated_in_range_async("5.0", "6.0")
+
+        # A new instance (as built per scan) shares the cache
+        items = HybridDeprecationDB().get_deprecated_in_range("5.0", "6.0")
+
+        assert "mcp_func" in {item.name for item in items}
@@ -1,62 +1,92 @@
 """
 Unit tests for WordPress MCP Client
 """
+import httpx
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from app.services.wordpress.mcp_client import WordPressMCPClient
+import respx
+from unittest.mock import patch
+from app.services.wordpress import mcp_client
+from app.services.wordpress.mcp_client import WordPressMCPClient, close_mcp_client
 from app.services.wordpress.deprecation_db import ChangeType
 
 
+MCP_URL = "https://api.test.com"
+
+# Prebuilt /deprecations payload shared by MCP tests
+_SAMPLE_DEPRECATIONS = (
+    {
+        "name": "test_func",
+        "deprecated_in": "5.0",
+        "change_type": "deprecated_function",
+        "severity": "medium",
+        "description": "Test deprecation"
+    },
+)
+
+
 @pytest.fixture
 def mock_settings():
     with patch("app.services.wordpress.mcp_client.settings") as mock:
-        mock.WORDPRESS_MCP_URL = "https://api.test.com"
+        mock.WORDPRESS_MCP_URL = MCP_URL
         mock.WORDPRESS_MCP_API_KEY = "test_key"
         mock.WORDPRESS_MCP_ENABLED = True
         yield mock
 
 
+@pytest.fixture(scope="module")
+def mcp_router():
+    """Mock the MCP server at the httpx transport once for the module"""
+    with respx.mock(base_url=MCP_URL, assert_all_called=False) as router:
+        router.get("/deprecations", name="deprecations")
+        yield router
+
+
+@pytest.fixture
+def deprecations_route(mcp_router):
+    """The /deprecations route with responses and calls from earlier tests cleared"""
+    route = mcp_router["deprecations"]
+    route.reset()
+    route.side_effect = None
+    route.return_value = None
+    return route
+
+
 @pytest.mark.asyncio
-async def test_get_deprecations_success(mock_settings):
+async def test_get_deprecations_success(mock_settings, deprecations_route):
     """Test successful deprecation retrieval"""
     client = WordPressMCPClient()
-    
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [
-        {
-            "name": "test_func",
-            "deprecated_in": "5.0",
-            "change_type": "deprecated_function",
-            "severity": "medium",
-            "description": "Test deprecation"
-        }
-    ]
-    
-    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
-        mock_get.return_value = mock_response
-        
-        items = await client.get_deprecations("4.9", "5.0")
-        
-        assert len(items) == 1
-        assert items[0].name == "test_func"
-        assert items[0].change_type == ChangeType.DEPRECATED_FUNCTION
-        
-        # Verify API call
-        mock_get.assert_called_once()
-        args, kwargs = mock_get.call_args
-        assert kwargs["params"] == {"from": "4.9", "to": "5.0"}
-        assert kwargs["headers"]["Authorization"] == "Bearer test_key"
+    deprecations_route.respond(200, json=_SAMPLE_DEPRECATIONS)
+
+    items = await client.get_deprecations("4.9", "5.0")
+
+    assert len(items) == 1
+    assert items[0].name == "test_func"
+    assert items[0].change_type == ChangeType.DEPRECATED_FUNCTION
+
+    # Verify API call
+    assert deprecations_route.call_count == 1
+    request = deprecations_route.calls.last.request
+    assert dict(request.url.params) == {"from": "4.9", "to": "5.0"}
+    assert request.headers["Authorization"] == "Bearer test_key"
 
 
 @pytest.mark.asyncio
-async def test_get_deprecations_error(mock_settings):
+async def test_get_deprecations_error(mock_settings, deprecations_route):
     """Test error handling"""
     client = WordPressMCPClient()
-    
-    with patch("httpx.AsyncClient.get", side_effect=Exception("Network error")):
-        items = await client.get_deprecations("4.9", "5.0")
-        assert items == []
+    deprecations_route.side_effect = httpx.ConnectError("Network error")
+
+    items = await client.get_deprecations("4.9", "5.0")
+    assert items is None
+
+
+@pytest.mark.asyncio
+async def test_get_deprecations_server_error(mock_settings, deprecations_route):
+    """Test that a non-200 response is reported as a failed lookup"""
+    client = WordPressMCPClient()
+    deprecations_route.respond(503)
+
+    assert await client.get_deprecations("4.9", "5.0") is None
 
 
 @pytest.mark.asyncio
@@ -69,5 +99,45 @@ async def test_disabled_client(mock_settings):
     assert items == []
 
 
+@pytest.mark.asyncio
+async def test_enabled_flag_read_at_init(mock_settings, deprecations_route):
+    """Test that the enabled flag is snapshotted when the client is built"""
+    client = WordPressMCPClient()
+
+    # Flipping the setting later does not affect an existing client
+    mock_settings.WORDPRESS_MCP_ENABLED = False
+    deprecations_route.respond(200, json=[])
+
+    assert await client.get_deprecations("4.9", "5.0") == []
+    assert deprecations_route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_http_client_shared_until_closed(mock_settings):
+    """Test that lookups share one HTTP client per event loop until closed"""
+    first = await mcp_client._get_http_client()
+    assert await mcp_client._get_http_client() is first
+
+    await close_mcp_client()
+
+    assert first.is_closed
+    second = await mcp_client._get_http_client()
+    assert second is not first
+    await close_mcp_client()
+
+
+@pytest.mark.asyncio
+async def test_http_client_closed_on_loop_change(mock_settings):
+    """Test that the client bound to a previous event loop is closed, not leaked"""
+    first = await mcp_client._get_http_client()
+    mcp_client._http_client_loop = object()  # as if created on an earlier loop
+
+    second = await mcp_client._get_http_client()
+
+    assert second is not first
+    assert first.is_closed
+    await close_mcp_client()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
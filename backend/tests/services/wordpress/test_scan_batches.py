@@ -0,0 +1,42 @@
+"""
+Test concurrent AI batch processing in the scanner
+"""
+import asyncio
+
+import pytest
+
+from app.services.wordpress.scanner import WordPressScanner
+
+
+@pytest.mark.asyncio
+async def test_scan_files_bounds_concurrent_batches(tmp_path, mocker):
+    """Test that batches overlap but never exceed MAX_CONCURRENT_BATCHES"""
+    files = []
+    for i in range(6):
+        path = tmp_path / f"plugin{i}.php"
+        path.write_text(f"<?php\nfunction plugin_{i}() {{}}\n")
+        files.append(path)
+
+    scanner = WordPressScanner("5.0", "6.0")
+    mocker.patch.object(scanner, "MAX_CONCURRENT_BATCHES", 2)
+    mocker.patch.object(scanner, "_batch_files", return_value=[[f] for f in files])
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_scan_batch(batch):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [{"file": batch[0].name, "source": "ai_analysis"}]
+
+    mocker.patch.object(scanner, "_scan_batch", side_effect=fake_scan_batch)
+
+    issues = await scanner.scan_files(files)
+
+    assert peak == 2
+    assert scanner.stats["batches_processed"] == 6
+    ai_files = [i["file"] for i in issues if i.get("source") == "ai_analysis"]
+    assert ai_files == [f.name for f in files]
@@ -1,41 +1,60 @@
 """
 Test token estimation functionality
 """
+import os
 import pytest
 from pathlib import Path
 from app.services.wordpress.scanner import WordPressScanner
 
 
-def test_estimate_tokens_for_file(tmp_path):
+@pytest.fixture(scope="session")
+def sample_php_files(tmp_path_factory):
+    """
+    Read-only PHP files shared by the estimation tests
+
+    small: 5 files of ~850 characters
+    sized: 10 files of increasing size
+    large: sparse ~2.1MB file, estimated from its size without reading it
+    """
+    root = tmp_path_factory.mktemp("php_files")
+
+    small = []
+    for i in range(5):
+        test_file = root / f"small{i}.php"
+        test_file.write_bytes(b"<?php\n" + (f"// Test line {i}\n".encode() * 50))
+        small.append(test_file)
+
+    sized = []
+    for i in range(10):
+        test_file = root / f"sized{i}.php"
+        test_file.write_bytes(b"<?php\n" + (f"// Test line {i}\n".encode() * (100 * (i + 1))))
+        sized.append(test_file)
+
+    # Need > 3 * MAX_TOKENS_PER_BATCH (150000) tokens for 'medium' risk;
+    # at 4 chars per token that is > 1.8M characters
+    large = root / "large.php"
+    large.write_bytes(b"<?php\n")
+    os.truncate(large, 2_100_006)
+
+    return {"small": small, "sized": sized, "large": large}
+
+
+def test_estimate_tokens_for_file(sample_php_files):
     """Test token estimation for a single file"""
     scanner = WordPressScanner(version_from="5.9", version_to="6.4")
     
-    # Create a test file
-    test_file = tmp_path / "test.php"
-    test_content = "<?php\n" + ("// Test line\n" * 100)  # ~1300 characters
-    test_file.write_text(test_content)
+    tokens = scanner._estimate_tokens_for_file(sample_php_files["small"][0])
     
-    tokens = scanner._estimate_tokens_for_file(test_file)
-    
-    # Should estimate accurate tokens (around 300-450 for this content)
-    # Previous estimate had +500 overhead, new one is accurate
+    # Should estimate accurate tokens (around 200-300 for this content)
     assert tokens > 100
     assert tokens < 500
 
 
-def test_estimate_total_tokens(tmp_path):
+def test_estimate_total_tokens(sample_php_files):
     """Test total token estimation for a project"""
     scanner = WordPressScanner(version_from="5.9", version_to="6.4")
     
-    # Create multiple test files
-    files = []
-    for i in range(5):
-        test_file = tmp_path / f"file{i}.php"
-        test_content = "<?php\n" + (f"// Test line {i}\n" * 50)
-        test_file.write_text(test_content)
-        files.append(test_file)
-    
-    estimate = scanner.estimate_total_tokens(files)
+    estimate = scanner.estimate_total_tokens(sample_php_files["small"])
     
     # Verify structure
     assert 'total_files' in estimate
@@ -51,39 +70,22 @@ def test_estimate_total_tokens(tmp_path):
     assert estimate['context_overflow_risk'] in ['low', 'medium', 'high']
 
 
-def test_context_overflow_detection(tmp_path):
+def test_context_overflow_detection(sample_php_files):
     """Test detection of context overflow risk"""
     scanner = WordPressScanner(version_from="5.9", version_to="6.4")
     
-    # Create a very large file that would overflow context
-    # Need to exceed 3 * MAX_TOKENS_PER_BATCH for 'medium' risk
-    # MAX_TOKENS_PER_BATCH = 150000, so need > 450000 tokens
-    # At 4 chars per token, need > 1.8M characters
-    large_file = tmp_path / "large.php"
-    large_content = "<?php\n" + ("// Test line with some content here\n" * 60000)  # ~2.1M characters
-    large_file.write_text(large_content)
-    
-    estimate = scanner.estimate_total_tokens([large_file])
+    estimate = scanner.estimate_total_tokens([sample_php_files["large"]])
     
     # Should detect medium or high overflow risk
     assert estimate['context_overflow_risk'] in ['medium', 'high']
     assert estimate['estimated_batches'] > 1
 
 
-def test_batching_respects_token_limits(tmp_path):
+def test_batching_respects_token_limits(sample_php_files):
     """Test that batching respects token limits"""
     scanner = WordPressScanner(version_from="5.9", version_to="6.4")
     
-    # Create files of varying sizes
-    files = []
-    for i in range(10):
-        test_file = tmp_path / f"file{i}.php"
-        # Create files with increasing sizes
-        test_content = "<?php\n" + (f"// Test line {i}\n" * (100 * (i + 1)))
-        test_file.write_text(test_content)
-        files.append(test_file)
-    
-    batches = scanner._batch_files(files)
+    batches = scanner._batch_files(sample_php_files["sized"])
     
     # Verify each batch respects limits
     for batch in batches:
@@ -92,5 +94,35 @@ def test_batching_respects_token_limits(tmp_path):
         assert len(batch) <= 20  # Max files per batch
 
 
+def test_fast_estimate_uses_calibrated_ratio_without_reading(sample_php_files, mocker):
+    """Test that fast estimates calibrate once and then only stat files"""
+    scanner = WordPressScanner(version_from="5.9", version_to="6.4")
+    count_tokens = mocker.spy(scanner.optimizer, "count_tokens")
+    files = sample_php_files["sized"]
+
+    estimate = scanner.estimate_total_tokens(files)
+
+    # One exact count for the calibration sample only
+    assert count_tokens.call_count == 1
+    expected = sum(int(f.stat().st_size / scanner.chars_per_token) for f in files)
+    assert estimate['total_tokens'] == expected
+
+
+def test_token_estimate_cached_until_file_changes(tmp_path, mocker):
+    """Test that estimates are reused until the file's size or mtime changes"""
+    scanner = WordPressScanner(version_from="5.9", version_to="6.4")
+    test_file = tmp_path / "cached.php"
+    test_file.write_bytes(b"<?php\n" + (b"// Test line\n" * 100))
+    count_tokens = mocker.spy(scanner.optimizer, "count_tokens")
+
+    first = scanner._estimate_tokens_for_file(test_file, exact=True)
+    assert scanner._estimate_tokens_for_file(test_file, exact=True) == first
+    assert count_tokens.call_count == 1
+
+    test_file.write_bytes(b"<?php\n" + (b"// Test line\n" * 200))
+    assert scanner._estimate_tokens_for_file(test_file, exact=True) > first
+    assert count_tokens.call_count == 2
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -6,9 +6,9 @@ from pathlib import Path
 from app.services.wordpress.token_optimizer import TokenOptimizer
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def optimizer():
-    """Create optimizer instance"""
+    """Create optimizer instance (stateless, so shared across the module)"""
     return TokenOptimizer()
 
 
@@ -35,6 +35,18 @@ def test_count_tokens(optimizer):
     assert count < 20
 
 
+def test_encoder_loaded_once_per_process(mocker):
+    """Test that instances share one lazily loaded encoder"""
+    get_encoding = mocker.patch("app.services.wordpress.token_optimizer.tiktoken.get_encoding")
+    mocker.patch.object(TokenOptimizer, "_encoder", None)
+    mocker.patch.object(TokenOptimizer, "_encoder_loaded", False)
+    
+    TokenOptimizer().count_tokens("function a() {}")
+    TokenOptimizer().count_tokens("function b() {}")
+    
+    get_encoding.assert_called_once_with("cl100k_base")
+
+
 def test_remove_comments(optimizer):
     """Test comment removal"""
     code = """
@@ -66,6 +78,35 @@ def test_remove_comments(optimizer):
     assert "old_function" in cleaned
 
 
+def test_remove_comments_keeps_comment_markers_in_strings(optimizer):
+    """Test that // and # inside string literals are not treated as comments"""
+    code = """<?php
+    $url = "http://example.com/#top"; // trailing
+    $msg = 'it\\'s # not a comment';
+    """
+    
+    cleaned = optimizer._remove_comments(code)
+    
+    assert '"http://example.com/#top";' in cleaned
+    assert "'it\\'s # not a comment';" in cleaned
+    assert "trailing" not in cleaned
+
+
+def test_remove_comments_in_mixed_html_php_template(optimizer):
+    """Test that an apostrophe in template markup doesn't swallow later PHP strings"""
+    code = """<p>Don't miss our feed</p>
+<?php $feed = 'https://example.com/feed'; ?>
+<?php echo $feed; // print it ?>
+"""
+    
+    cleaned = optimizer._remove_comments(code)
+    
+    assert "<p>Don't miss our feed</p>" in cleaned
+    assert "<?php $feed = 'https://example.com/feed'; ?>" in cleaned
+    assert "<?php echo $feed; ?>" in cleaned
+    assert "print it" not in cleaned
+
+
 def test_collapse_whitespace(optimizer):
     """Test whitespace collapsing"""
     code = """
@@ -159,5 +200,20 @@ def test_extract_critical_sections(optimizer):
     assert "$_GET" in extracted
 
 
+
+def test_extract_critical_sections_keeps_hook_after_gated_match(optimizer):
+    """Test that a hook overlapping an ungated user-input match is still kept"""
+    code = """<?php
+    foreach ( $_GET as $key => $value ) {
+        add_action( 'init', 'register_' . $key );
+    }
+    """
+    
+    patterns = optimizer.extract_file_patterns(code)
+    extracted = optimizer._extract_critical_sections(code, patterns)
+    
+    assert not patterns['has_user_input']
+    assert "add_action( 'init', 'register_' . $key );" in extracted.split('\n\n')
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -1,50 +1,18 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from functools import lru_cache
 from unittest.mock import MagicMock, patch
 from datetime import datetime
 
-from app.main import app
-from app.db.session import get_db
-from app.models.base import Base
 from app.models.user import User, UserPlan
 from app.models.site import Site
 from app.models.scan import Scan, ScanStatus
 from app.core.security import create_access_token
 
-# Setup in-memory SQLite DB
-SQLALCHEMY_DATABASE_URL = "sqlite://"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base.metadata.create_all(bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-app.dependency_overrides[get_db] = override_get_db
-
-client = TestClient(app)
-
+# The schema is created once per session by the shared conftest engine;
+# each test runs inside a transaction that is rolled back afterwards
 @pytest.fixture
-def db():
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    yield db
-    db.close()
-    Base.metadata.drop_all(bind=engine)
+def db(db_session):
+    return db_session
 
 @pytest.fixture
 def free_user(db):
@@ -56,7 +24,7 @@ def free_user(db):
         is_verified=True
     )
     db.add(user)
-    db.commit()
+    db.flush()
     db.refresh(user)
     return user
 
@@ -70,34 +38,45 @@ def pro_user(db):
         is_verified=True
     )
     db.add(user)
-    db.commit()
+    db.flush()
     db.refresh(user)
     return user
 
+@pytest.fixture(scope="module")
+def null_upload_side_effects():
+    # FastAPI builds BackgroundTasks itself rather than resolving it as a
+    # dependency, so dependency_overrides can't replace it; patch the
+    # upload's side effects once for the module instead of per test
+    with patch("app.api.v1.endpoints.scans.shutil.copyfileobj"), \
+         patch("app.api.v1.endpoints.scans.BackgroundTasks.add_task"):
+        yield
+
+@lru_cache(maxsize=None)
+def make_token(user_id: int) -> str:
+    # Rolled-back inserts hand out the same ids every test, so each token
+    # is signed once per session
+    return create_access_token(data={"user_id": user_id})
+
 @pytest.fixture
 def user_token(free_user):
-    return create_access_token(data={"user_id": free_user.id})
+    return make_token(free_user.id)
 
 @pytest.fixture
 def pro_token(pro_user):
-    return create_access_token(data={"user_id": pro_user.id})
+    return make_token(pro_user.id)
 
-def test_pdf_download_endpoint(db, pro_user, pro_token):
-    # Create a site first
+async def test_pdf_download_endpoint(async_client, db, pro_user, pro_token):
+    # Create a site and a completed scan for it in one transaction
     site = Site(user_id=pro_user.id, url="http://pdf-test.com", name="PDF Test Site")
-    db.add(site)
-    db.commit()
-
-    # Create a completed scan
     scan = Scan(
         user_id=pro_user.id,
-        site_id=site.id,
+        site=site,
         status=ScanStatus.COMPLETED,
         wordpress_version_from="5.0",
         wordpress_version_to="6.0",
         created_at=datetime.utcnow()
     )
-    db.add(scan)
+    db.add_all([site, scan])
     db.commit()
     db.refresh(scan)
 
@@ -108,7 +87,7 @@ def test_pdf_download_endpoint(db, pro_user, pro_token):
         
         print(f"DEBUG: Scan ID: {scan.id}, User ID: {scan.user_id}, Pro User ID: {pro_user.id}")
         
-        response = client.get(
+        response = await async_client.get(
             f"/api/v1/scans/{scan.id}/report",
             headers={"Authorization": f"Bearer {pro_token}"}
         )
@@ -119,65 +98,60 @@ def test_pdf_download_endpoint(db, pro_user, pro_token):
         assert response.headers["content-type"] == "application/pdf"
         assert response.content == b"%PDF-1.4 mock content"
 
-def test_scan_limit_enforcement(db, free_user, user_token):
+@pytest.mark.usefixtures("null_upload_side_effects")
+async def test_scan_limit_enforcement(async_client, db, free_user, user_token):
     # Create a site
     site = Site(user_id=free_user.id, url="http://example.com", name="Test Site")
     db.add(site)
-    db.commit()
+    db.flush()
     
     # 1. First scan should succeed (limit is 1/day)
-    # We mock the upload to avoid file system ops
-    with patch("app.api.v1.endpoints.scans.shutil.copyfileobj"), \
-         patch("app.api.v1.endpoints.scans.BackgroundTasks.add_task"):
-        
-        files = {'file': ('test.zip', b'test content', 'application/zip')}
-        data = {
-            'site_id': site.id,
-            'wordpress_version_from': '5.0',
-            'wordpress_version_to': '6.0'
-        }
-        
-        response = client.post(
-            "/api/v1/scans/upload",
-            headers={"Authorization": f"Bearer {user_token}"},
-            files=files,
-            data=data
-        )
-        assert response.status_code == 202
-        
-        # 2. Second scan should fail
-        response = client.post(
-            "/api/v1/scans/upload",
-            headers={"Authorization": f"Bearer {user_token}"},
-            files=files,
-            data=data
-        )
-        assert response.status_code == 403
-        assert "Daily scan limit reached" in response.json()["detail"]
+    files = {'file': ('test.zip', b'test content', 'application/zip')}
+    data = {
+        'site_id': site.id,
+        'wordpress_version_from': '5.0',
+        'wordpress_version_to': '6.0'
+    }
+    
+    response = await async_client.post(
+        "/api/v1/scans/upload",
+        headers={"Authorization": f"Bearer {user_token}"},
+        files=files,
+        data=data
+    )
+    assert response.status_code == 202
+    
+    # 2. Second scan should fail
+    response = await async_client.post(
+        "/api/v1/scans/upload",
+        headers={"Authorization": f"Bearer {user_token}"},
+        files=files,
+        data=data
+    )
+    assert response.status_code == 403
+    assert "Daily scan limit reached" in response.json()["detail"]
 
-def test_pro_user_unlimited_scans(db, pro_user, pro_token):
+@pytest.mark.usefixtures("null_upload_side_effects")
+async def test_pro_user_unlimited_scans(async_client, db, pro_user, pro_token):
     # Create a site
     site = Site(user_id=pro_user.id, url="http://pro.example.com", name="Pro Site")
     db.add(site)
-    db.commit()
+    db.flush()
     
-    with patch("app.api.v1.endpoints.scans.shutil.copyfileobj"), \
-         patch("app.api.v1.endpoints.scans.BackgroundTasks.add_task"):
-        
-        files = {'file': ('test.zip', b'test content', 'application/zip')}
-        data = {
-            'site_id': site.id,
-            'wordpress_version_from': '5.0',
-            'wordpress_version_to': '6.0'
-        }
-        
-        # Run multiple scans
-        for _ in range(3):
-            response = client.post(
-                "/api/v1/scans/upload",
-                headers={"Authorization": f"Bearer {pro_token}"},
-                files=files,
-                data=data
-            )
-            assert response.status_code == 202
+    files = {'file': ('test.zip', b'test content', 'application/zip')}
+    data = {
+        'site_id': site.id,
+        'wordpress_version_from': '5.0',
+        'wordpress_version_to': '6.0'
+    }
+    
+    # Run multiple scans
+    for _ in range(3):
+        response = await async_client.post(
+            "/api/v1/scans/upload",
+            headers={"Authorization": f"Bearer {pro_token}"},
+            files=files,
+            data=data
+        )
+        assert response.status_code == 202
 
@@ -0,0 +1,71 @@
+"""
+Unit tests for the daily scan limit dependency
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.api.dependencies import check_scan_limits
+from app.models.user import UserPlan
+
+
+@pytest.fixture(scope="module")
+def mock_db() -> MagicMock:
+    """Session stand-in whose scan count each case sets before the call"""
+    return MagicMock()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("plan,count,raises", [
+    (UserPlan.PRO, 99, False),
+    (UserPlan.FREE, 0, False),
+    (UserPlan.FREE, 1, True),
+], ids=["pro_unlimited", "free_under_limit", "free_limit_reached"])
+async def test_check_scan_limits(mock_db, plan, count, raises):
+    """Test that only free users at their daily limit are blocked"""
+    # Arrange
+    user = SimpleNamespace(id=1, email="user@example.com", plan=plan)
+    mock_db.query.return_value.filter.return_value.count.return_value = count
+
+    # Act & Assert
+    if raises:
+        with pytest.raises(HTTPException) as exc_info:
+            await check_scan_limits(current_user=user, db=mock_db)
+        assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+    else:
+        assert await check_scan_limits(current_user=user, db=mock_db) is user
+
+
+@pytest.mark.asyncio
+async def test_check_scan_limits_caches_limit_reached():
+    """Test that a user at the limit is blocked again without a second count"""
+    # Arrange
+    db = MagicMock()
+    db.query.return_value.filter.return_value.count.return_value = 1
+    user = SimpleNamespace(id=2, email="free@example.com", plan=UserPlan.FREE)
+
+    # Act & Assert
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await check_scan_limits(current_user=user, db=db)
+    assert db.query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_check_scan_limits_does_not_cache_under_limit():
+    """Test that an allowed user is counted again so a new scan is seen"""
+    # Arrange
+    db = MagicMock()
+    db.query.return_value.filter.return_value.count.return_value = 0
+    user = SimpleNamespace(id=3, email="free@example.com", plan=UserPlan.FREE)
+
+    # Act
+    await check_scan_limits(current_user=user, db=db)
+    db.query.return_value.filter.return_value.count.return_value = 1
+
+    # Assert
+    with pytest.raises(HTTPException):
+        await check_scan_limits(current_user=user, db=db)
+    assert db.query.call_count == 2
@@ -6,55 +6,46 @@ import pytest
 from datetime import datetime, timedelta
 from freezegun import freeze_time
 
+from app.api.v1.endpoints.auth import LOCKOUT_DURATION_MINUTES
 from app.models.user import User
 
+LOCKOUT_DURATION = timedelta(minutes=LOCKOUT_DURATION_MINUTES)
+
 
 class TestAccountLockoutModel:
     """Test account lockout fields in User model"""
 
-    def test_user_has_lockout_fields(self, db_session, user_factory):
-        """Test that User model has lockout-related fields"""
-        # Arrange & Act
-        user = user_factory.create(db_session)
-
+    def test_user_has_lockout_fields(self):
+        """Test that User model has lockout-related columns"""
         # Assert
-        assert hasattr(user, 'failed_login_attempts')
-        assert hasattr(user, 'locked_until')
-        assert hasattr(user, 'last_failed_login')
+        lockout_columns = {"failed_login_attempts", "locked_until", "last_failed_login"}
+        assert lockout_columns <= set(User.__table__.columns.keys())
 
-    def test_new_user_has_zero_failed_attempts(self, db_session, user_factory):
+    def test_new_user_has_zero_failed_attempts(self, test_user):
         """Test that new users start with zero failed attempts"""
-        # Arrange & Act
-        user = user_factory.create(db_session)
-
         # Assert
-        assert user.failed_login_attempts == 0
+        assert test_user.failed_login_attempts == 0
 
-    def test_new_user_not_locked(self, db_session, user_factory):
+    def test_new_user_not_locked(self, test_user):
         """Test that new users are not locked"""
-        # Arrange & Act
-        user = user_factory.create(db_session)
-
         # Assert
-        assert user.locked_until is None
+        assert test_user.locked_until is None
 
     def test_user_can_be_locked(self, db_session, user_factory):
         """Test that user can be locked with lockout time"""
-        # Arrange
-        lockout_time = datetime.utcnow() + timedelta(minutes=30)
+        # Arrange & Act
+        now = datetime.utcnow()
+        lockout_time = now + LOCKOUT_DURATION
         user = user_factory.create(
             db_session,
             failed_login_attempts=5,
             locked_until=lockout_time
         )
 
-        # Act
-        db_session.refresh(user)
-
         # Assert
         assert user.failed_login_attempts == 5
         assert user.locked_until is not None
-        assert user.locked_until >= datetime.utcnow()
+        assert user.locked_until >= now
 
     def test_failed_attempts_can_increment(self, db_session, user_factory):
         """Test that failed login attempts can be incremented"""
@@ -64,7 +55,7 @@ class TestAccountLockoutModel:
         # Act
         user.failed_login_attempts += 1
         user.last_failed_login = datetime.utcnow()
-        db_session.commit()
+        db_session.flush()
         db_session.refresh(user)
 
         # Assert
@@ -77,10 +68,8 @@ class TestAccountLockoutModel:
         user = user_factory.create(db_session, failed_login_attempts=3)
 
         # Act
-        user.failed_login_attempts = 0
-        user.last_failed_login = None
-        user.locked_until = None
-        db_session.commit()
+        user.clear_lockout()
+        db_session.flush()
         db_session.refresh(user)
 
         # Assert
@@ -92,37 +81,36 @@ class TestAccountLockoutModel:
 class TestAccountLockoutLogic:
     """Test account lockout logic"""
 
-    def test_user_locked_when_lockout_time_in_future(self, db_session, user_factory):
+    def test_user_locked_when_lockout_time_in_future(self, user_factory):
         """Test that user is considered locked when lockout time is in future"""
         # Arrange
-        future_lockout = datetime.utcnow() + timedelta(minutes=15)
-        user = user_factory.create(
-            db_session,
+        now = datetime.utcnow()
+        future_lockout = now + timedelta(minutes=15)
+        user = user_factory.build(
             failed_login_attempts=5,
             locked_until=future_lockout
         )
 
         # Act & Assert
-        assert user.locked_until > datetime.utcnow()
+        assert user.locked_until > now
 
-    def test_user_not_locked_when_lockout_time_expired(self, db_session, user_factory):
+    def test_user_not_locked_when_lockout_time_expired(self, user_factory):
         """Test that user is not locked when lockout time has passed"""
         # Arrange
-        past_lockout = datetime.utcnow() - timedelta(minutes=1)
-        user = user_factory.create(
-            db_session,
+        now = datetime.utcnow()
+        past_lockout = now - timedelta(minutes=1)
+        user = user_factory.build(
             failed_login_attempts=5,
             locked_until=past_lockout
         )
 
         # Act & Assert
-        assert user.locked_until < datetime.utcnow()
+        assert user.locked_until < now
 
-    def test_user_not_locked_when_no_lockout_time(self, db_session, user_factory):
+    def test_user_not_locked_when_no_lockout_time(self, user_factory):
         """Test that user is not locked when locked_until is None"""
         # Arrange
-        user = user_factory.create(
-            db_session,
+        user = user_factory.build(
             failed_login_attempts=2,
             locked_until=None
         )
@@ -130,23 +118,22 @@ class TestAccountLockoutLogic:
         # Act & Assert
         assert user.locked_until is None
 
-    def test_lockout_duration_correct(self, db_session, user_factory):
+    def test_lockout_duration_correct(self, user_factory):
         """Test that lockout duration is set correctly (typically 30 minutes)"""
         # Arrange
-        lockout_duration_minutes = 30
-        lockout_time = datetime.utcnow() + timedelta(minutes=lockout_duration_minutes)
+        now = datetime.utcnow()
+        lockout_time = now + LOCKOUT_DURATION
 
-        user = user_factory.create(
-            db_session,
+        user = user_factory.build(
             failed_login_attempts=5,
             locked_until=lockout_time
         )
 
         # Act
-        time_until_unlock = (user.locked_until - datetime.utcnow()).total_seconds() / 60
+        time_until_unlock = (user.locked_until - now).total_seconds() / 60
 
-        # Assert - should be approximately 30 minutes (allow 1 minute tolerance)
-        assert 29 <= time_until_unlock <= 31
+        # Assert
+        assert time_until_unlock == LOCKOUT_DURATION_MINUTES
 
 
 class TestAccountLockoutThresholds:
@@ -158,51 +145,44 @@ class TestAccountLockoutThresholds:
         assert locked_user.failed_login_attempts == 5
         assert locked_user.locked_until is not None
 
-    def test_user_not_locked_below_threshold(self, db_session, user_factory):
+    def test_user_not_locked_below_threshold(self, user_factory):
         """Test that user is not locked below threshold"""
         # Arrange & Act
-        for attempts in range(1, 5):
-            user = user_factory.create(
-                db_session,
+        users = [
+            user_factory.build(
                 email=f"user{attempts}@example.com",
                 failed_login_attempts=attempts,
                 locked_until=None
             )
+            for attempts in range(1, 5)
+        ]
 
-            # Assert
+        # Assert
+        for user in users:
             assert user.locked_until is None
 
-    def test_last_failed_login_timestamp_set(self, db_session, user_factory):
+    @freeze_time("2024-01-01 12:00:00")
+    def test_last_failed_login_timestamp_set(self, user_factory):
         """Test that last failed login timestamp is recorded"""
         # Arrange
-        with freeze_time("2024-01-01 12:00:00"):
-            user = user_factory.create(
-                db_session,
-                failed_login_attempts=1,
-                last_failed_login=datetime.utcnow()
-            )
-
-        # Act
-        db_session.refresh(user)
+        user = user_factory.build(
+            failed_login_attempts=1,
+            last_failed_login=datetime.utcnow()
+        )
 
         # Assert
-        assert user.last_failed_login is not None
-        expected_time = datetime.strptime("2024-01-01 12:00:00", "%Y-%m-%d %H:%M:%S")
-        # Allow 2 seconds tolerance
-        time_diff = abs((user.last_failed_login - expected_time).total_seconds())
-        assert time_diff < 2
+        assert user.last_failed_login == datetime(2024, 1, 1, 12, 0, 0)
 
 
 class TestAccountLockoutRecovery:
     """Test account lockout recovery mechanisms"""
 
-    def test_lockout_expires_after_duration(self, db_session, user_factory):
+    def test_lockout_expires_after_duration(self, user_factory):
         """Test that lockout automatically expires"""
         # Arrange
-        with freeze_time("2024-01-01 12:00:00"):
-            lockout_until = datetime.utcnow() + timedelta(minutes=30)
-            user = user_factory.create(
-                db_session,
+        with freeze_time("2024-01-01 12:00:00") as frozen:
+            lockout_until = datetime.utcnow() + LOCKOUT_DURATION
+            user = user_factory.build(
                 failed_login_attempts=5,
                 locked_until=lockout_until
             )
@@ -210,8 +190,9 @@ class TestAccountLockoutRecovery:
             # User is locked at 12:00
             assert user.locked_until > datetime.utcnow()
 
-        # Act - Move time forward past lockout expiration
-        with freeze_time("2024-01-01 12:31:00"):
+            # Act - Move time forward past lockout expiration
+            frozen.move_to("2024-01-01 12:31:00")
+
             # Assert - Lockout has expired
             assert user.locked_until < datetime.utcnow()
 
@@ -225,9 +206,8 @@ class TestAccountLockoutRecovery:
         )
 
         # Act - Simulate successful login
-        user.failed_login_attempts = 0
-        user.last_failed_login = None
-        db_session.commit()
+        user.clear_lockout()
+        db_session.flush()
         db_session.refresh(user)
 
         # Assert
@@ -240,10 +220,8 @@ class TestAccountLockoutRecovery:
         assert locked_user.locked_until is not None
 
         # Act - Admin manually unlocks
-        locked_user.failed_login_attempts = 0
-        locked_user.locked_until = None
-        locked_user.last_failed_login = None
-        db_session.commit()
+        locked_user.clear_lockout()
+        db_session.flush()
         db_session.refresh(locked_user)
 
         # Assert
@@ -257,10 +235,8 @@ class TestAccountLockoutRecovery:
         assert locked_user.locked_until is not None
 
         # Act - Simulate password reset
-        locked_user.failed_login_attempts = 0
-        locked_user.locked_until = None
-        locked_user.last_failed_login = None
-        db_session.commit()
+        locked_user.clear_lockout()
+        db_session.flush()
         db_session.refresh(locked_user)
 
         # Assert
@@ -271,13 +247,12 @@ class TestAccountLockoutRecovery:
 class TestAccountLockoutEdgeCases:
     """Test edge cases in account lockout"""
 
-    def test_lockout_at_exact_threshold(self, db_session, user_factory):
+    def test_lockout_at_exact_threshold(self, user_factory):
         """Test lockout behavior at exact threshold"""
         # Arrange & Act
-        user = user_factory.create(
-            db_session,
+        user = user_factory.build(
             failed_login_attempts=5,
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
+            locked_until=datetime.utcnow() + LOCKOUT_DURATION
         )
 
         # Assert
@@ -291,7 +266,7 @@ class TestAccountLockoutEdgeCases:
             db_session,
             email="user1@example.com",
             failed_login_attempts=5,
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
+            locked_until=datetime.utcnow() + LOCKOUT_DURATION
         )
 
         user2 = user_factory.create(
@@ -309,7 +284,7 @@ class TestAccountLockoutEdgeCases:
     def test_lockout_persists_across_sessions(self, db_session, user_factory):
         """Test that lockout persists in database"""
         # Arrange
-        lockout_time = datetime.utcnow() + timedelta(minutes=30)
+        lockout_time = datetime.utcnow() + LOCKOUT_DURATION
         user = user_factory.create(
             db_session,
             failed_login_attempts=5,
@@ -321,32 +296,30 @@ class TestAccountLockoutEdgeCases:
         db_session.expire_all()
 
         # Re-query user
-        user_reloaded = db_session.query(User).filter(User.id == user_id).first()
+        user_reloaded = db_session.get(User, user_id)
 
         # Assert
         assert user_reloaded.failed_login_attempts == 5
         assert user_reloaded.locked_until is not None
 
-    def test_failed_attempts_can_exceed_threshold(self, db_session, user_factory):
+    def test_failed_attempts_can_exceed_threshold(self, user_factory):
         """Test that failed attempts can exceed threshold without issues"""
         # Arrange & Act
-        user = user_factory.create(
-            db_session,
+        user = user_factory.build(
             failed_login_attempts=10,  # More than threshold
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
+            locked_until=datetime.utcnow() + LOCKOUT_DURATION
         )
 
         # Assert
         assert user.failed_login_attempts == 10
         assert user.locked_until is not None
 
-    def test_zero_failed_attempts_with_lockout_time(self, db_session, user_factory):
+    def test_zero_failed_attempts_with_lockout_time(self, user_factory):
         """Test edge case: zero attempts but lockout time set (shouldn't happen)"""
         # Arrange - This is an inconsistent state but should be handled
-        user = user_factory.create(
-            db_session,
+        user = user_factory.build(
             failed_login_attempts=0,
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
+            locked_until=datetime.utcnow() + LOCKOUT_DURATION
         )
 
         # Assert - System should still respect the lockout time
@@ -358,13 +331,13 @@ class TestAccountLockoutEdgeCases:
 class TestAccountLockoutSecurity:
     """Security-focused tests for account lockout"""
 
-    def test_lockout_prevents_brute_force_attacks(self, db_session, user_factory):
+    def test_lockout_prevents_brute_force_attacks(self, user_factory):
         """Test that lockout mechanism prevents brute force attacks"""
         # Arrange
-        user = user_factory.create(
-            db_session,
+        now = datetime.utcnow()
+        user = user_factory.build(
             failed_login_attempts=5,
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
+            locked_until=now + LOCKOUT_DURATION
         )
 
         # Assert
@@ -374,23 +347,14 @@ class TestAccountLockoutSecurity:
         assert user.locked_until is not None
 
         # Lockout should last long enough to slow down attacks
-        time_until_unlock = (user.locked_until - datetime.utcnow()).total_seconds() / 60
+        time_until_unlock = (user.locked_until - now).total_seconds() / 60
         assert time_until_unlock >= 15  # At least 15 minutes
 
-    def test_lockout_does_not_reveal_user_existence(self, db_session):
+    def test_lockout_does_not_reveal_user_existence(self, locked_user):
         """Test that lockout behavior doesn't leak user existence info"""
         # This is more of a design principle test
         # The API should return the same message whether user exists or not
 
-        # Arrange - Create locked user
-        from app.tests.conftest import UserFactory
-        locked_user = UserFactory.create(
-            db_session,
-            email="locked@example.com",
-            failed_login_attempts=5,
-            locked_until=datetime.utcnow() + timedelta(minutes=30)
-        )
-
         # Assert
         # The existence of lockout fields doesn't reveal information
         # The API layer should handle this properly
@@ -408,7 +372,7 @@ class TestAccountLockoutSecurity:
         assert time_until_unlock <= 60  # Max 1 hour
 
 
-@pytest.mark.parametrize("failed_attempts,should_be_locked", [
+LOCKOUT_THRESHOLD_CASES = [
     (0, False),
     (1, False),
     (2, False),
@@ -417,23 +381,32 @@ class TestAccountLockoutSecurity:
     (5, True),
     (6, True),
     (10, True),
-])
-def test_lockout_threshold_parametrized(db_session, user_factory, failed_attempts, should_be_locked):
-    """Parametrized test for lockout threshold"""
+]
+
+
+def test_lockout_threshold_cases(db_session, user_factory):
+    """Test the lockout threshold across attempt counts with one bulk insert"""
     # Arrange
-    lockout_time = datetime.utcnow() + timedelta(minutes=30) if should_be_locked else None
+    lockout_time = datetime.utcnow() + LOCKOUT_DURATION
 
     # Act
-    user = user_factory.create(
+    users = user_factory.create_many(
         db_session,
-        email=f"user{failed_attempts}@example.com",
-        failed_login_attempts=failed_attempts,
-        locked_until=lockout_time
+        [
+            {
+                "email": f"user{failed_attempts}@example.com",
+                "failed_login_attempts": failed_attempts,
+                "locked_until": lockout_time if should_be_locked else None,
+            }
+            for failed_attempts, should_be_locked in LOCKOUT_THRESHOLD_CASES
+        ]
     )
 
     # Assert
-    if should_be_locked:
-        assert user.failed_login_attempts >= 5
-        assert user.locked_until is not None
-    else:
-        assert user.locked_until is None
+    for user, (failed_attempts, should_be_locked) in zip(users, LOCKOUT_THRESHOLD_CASES):
+        assert user.failed_login_attempts == failed_attempts
+        if should_be_locked:
+            assert user.failed_login_attempts >= 5
+            assert user.locked_until is not None
+        else:
+            assert user.locked_until is None
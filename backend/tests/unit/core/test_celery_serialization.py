@@ -0,0 +1,69 @@
+"""
+Unit tests for Celery message serialization
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from app.core.celery_app import celery_app
+
+# Content types a worker accepts, as kombu resolves them from accept_content
+ACCEPT = prepare_accept_content(celery_app.conf.accept_content)
+
+WEBHOOK_TASK_KWARGS = {
+    "delivery_id": str(uuid.uuid4()),
+    "webhook_config_id": str(uuid.uuid4()),
+    "event_type": "scan_completed",
+    "payload": {
+        "scan_id": "42",
+        "site_name": "Test WordPress Site",
+        "risk_level": "warning",
+        "issues_found": 3,
+        "completed_at": datetime(2026, 1, 1, 12, 0).isoformat(),
+        "dashboard_url": "http://localhost:3000/scans/42",
+    },
+}
+
+
+class TestCeleryConfig:
+    """Test serializer configuration"""
+
+    def test_msgpack_is_default_and_json_still_accepted(self):
+        """Test that tasks use msgpack while JSON messages remain accepted"""
+        assert celery_app.conf.task_serializer == "msgpack"
+        assert celery_app.conf.result_serializer == "msgpack"
+        assert set(celery_app.conf.accept_content) == {"msgpack", "json"}
+
+
+class TestSerializationRoundTrip:
+    """Test that task payloads survive broker encoding"""
+
+    @pytest.mark.parametrize("serializer", ["msgpack", "json"])
+    def test_deliver_webhook_payload_round_trip(self, serializer):
+        """Test a deliver_webhook message body round trip"""
+        body = ((), WEBHOOK_TASK_KWARGS, {"callbacks": None, "errbacks": None})
+
+        content_type, encoding, data = dumps(body, serializer=serializer)
+        decoded = loads(data, content_type, encoding, accept=ACCEPT)
+
+        assert decoded[1] == WEBHOOK_TASK_KWARGS
+
+    def test_json_codec_keeps_kombu_types(self):
+        """Test that the orjson-backed codec round-trips kombu's custom types"""
+        value = {
+            "when": datetime(2026, 1, 1, 12, 0),
+            "amount": Decimal("19.99"),
+            1: "non-str key",
+        }
+
+        content_type, encoding, data = dumps(value, serializer="json")
+        decoded = loads(data, content_type, encoding, accept=ACCEPT)
+
+        assert decoded == {
+            "when": datetime(2026, 1, 1, 12, 0),
+            "amount": Decimal("19.99"),
+            "1": "non-str key",
+        }
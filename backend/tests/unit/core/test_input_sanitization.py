@@ -12,6 +12,9 @@ from app.core.input_sanitization import (
     truncate_string
 )
 
+# Without separators a filename cannot hold a traversal sequence either
+UNSAFE_FILENAME_CHARS = frozenset("/\\\x00")
+
 
 class TestHTMLSanitization:
     """Test HTML/XSS sanitization"""
@@ -245,6 +248,15 @@ class TestEmailValidation:
         # Assert
         assert result == "user@example.com"
 
+    def test_validate_email_rejects_overlong_address(self):
+        """Test that addresses longer than SMTP allows are rejected"""
+        # Arrange
+        email = "a" * 250 + "@example.com"
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid email format"):
+            validate_email_format(email)
+
     def test_validate_email_rejects_none(self):
         """Test that None is rejected"""
         # Act & Assert
@@ -367,11 +379,7 @@ class TestFilenameSanitization:
         result = sanitize_filename(dangerous_filename)
 
         # Assert
-        assert "../" not in result
-        assert "..\\" not in result
-        assert "/" not in result
-        assert "\\" not in result
-        assert "\x00" not in result
+        assert not UNSAFE_FILENAME_CHARS & set(result)
 
 
 class TestURLValidation:
@@ -6,14 +6,33 @@ import pytest
 from datetime import datetime, timedelta
 from freezegun import freeze_time
 
+from app.core import security as security_module
+from app.core.config import Settings, settings
+
 from app.core.security import (
     verify_password,
     get_password_hash,
     create_access_token,
     decode_access_token,
+    clear_password_verify_cache,
+    clear_token_cache,
     pwd_context
 )
 
+_SCHEMES = frozenset(pwd_context.schemes())
+
+
+@pytest.fixture(scope="module")
+def token_data() -> dict:
+    """Claims shared by tests that only need a representative payload"""
+    return {"sub": "test@example.com"}
+
+
+@pytest.fixture(scope="module")
+def sample_token() -> str:
+    """Default-expiry token for tests that only need something valid to decode"""
+    return create_access_token({"sub": "test@example.com"})
+
 
 class TestPasswordHashing:
     """Test password hashing functionality"""
@@ -56,11 +75,11 @@ class TestPasswordHashing:
         # Bcrypt hashes start with $2b$ or $2a$ or $2y$
         assert hashed.startswith("$2") or hashed.startswith("$2a") or hashed.startswith("$2b")
 
-    def test_verify_password_correct_password(self):
+    def test_verify_password_correct_password(self, hashed_password):
         """Test that correct password verification succeeds"""
         # Arrange
         password = "TestPassword123!"
-        hashed = get_password_hash(password)
+        hashed = hashed_password(password)
 
         # Act
         result = verify_password(password, hashed)
@@ -68,12 +87,12 @@ class TestPasswordHashing:
         # Assert
         assert result is True
 
-    def test_verify_password_incorrect_password(self):
+    def test_verify_password_incorrect_password(self, hashed_password):
         """Test that incorrect password verification fails"""
         # Arrange
         password = "TestPassword123!"
         wrong_password = "WrongPassword456!"
-        hashed = get_password_hash(password)
+        hashed = hashed_password(password)
 
         # Act
         result = verify_password(wrong_password, hashed)
@@ -81,12 +100,12 @@ class TestPasswordHashing:
         # Assert
         assert result is False
 
-    def test_verify_password_case_sensitive(self):
+    def test_verify_password_case_sensitive(self, hashed_password):
         """Test that password verification is case-sensitive"""
         # Arrange
         password = "TestPassword123!"
         wrong_case = "testpassword123!"
-        hashed = get_password_hash(password)
+        hashed = hashed_password(password)
 
         # Act
         result = verify_password(wrong_case, hashed)
@@ -94,11 +113,11 @@ class TestPasswordHashing:
         # Assert
         assert result is False
 
-    def test_verify_password_empty_password(self):
+    def test_verify_password_empty_password(self, hashed_password):
         """Test verification with empty password"""
         # Arrange
         password = "TestPassword123!"
-        hashed = get_password_hash(password)
+        hashed = hashed_password(password)
 
         # Act
         result = verify_password("", hashed)
@@ -110,7 +129,55 @@ class TestPasswordHashing:
         """Test that password context is properly configured"""
         # Assert
         assert pwd_context is not None
-        assert "bcrypt" in pwd_context.schemes()
+        assert "bcrypt" in _SCHEMES
+
+    def test_verify_password_cached_result_reused(self, mocker, hashed_password):
+        """Test that repeated verification of the same pair skips the KDF"""
+        # Arrange
+        clear_password_verify_cache()
+        password = "TestPassword123!"
+        hashed = hashed_password(password)
+        verify = mocker.spy(pwd_context, "verify")
+
+        # Act
+        first = verify_password(password, hashed)
+        second = verify_password(password, hashed)
+
+        # Assert
+        assert first is second is True
+        assert verify.call_count == 1
+
+    def test_verify_password_cache_cleared(self, mocker, hashed_password):
+        """Test that clearing the cache forces a fresh verification"""
+        # Arrange
+        password = "TestPassword123!"
+        hashed = hashed_password(password)
+        verify_password(password, hashed)
+        verify = mocker.spy(pwd_context, "verify")
+
+        # Act
+        clear_password_verify_cache()
+        result = verify_password(password, hashed)
+
+        # Assert
+        assert result is True
+        assert verify.call_count == 1
+
+    def test_verify_password_cache_disabled(self, mocker, hashed_password):
+        """Test that verification is not memoized unless opted in"""
+        # Arrange
+        mocker.patch("app.core.security.settings.TESTING", False)
+        mocker.patch("app.core.security.settings.PASSWORD_VERIFY_CACHE", False)
+        password = "TestPassword123!"
+        hashed = hashed_password(password)
+        verify = mocker.spy(pwd_context, "verify")
+
+        # Act
+        verify_password(password, hashed)
+        verify_password(password, hashed)
+
+        # Assert
+        assert verify.call_count == 2
 
 
 class TestJWTTokenCreation:
@@ -173,11 +240,11 @@ class TestJWTTokenCreation:
         """Test that default expiration is applied"""
         # Arrange
         data = {"sub": "test@example.com"}
+        now = datetime.utcnow()
 
         # Act
-        with freeze_time("2024-01-01 12:00:00"):
-            token = create_access_token(data)
-            decoded = decode_access_token(token)
+        token = create_access_token(data)
+        decoded = decode_access_token(token)
 
         # Assert
         assert decoded is not None
@@ -185,7 +252,6 @@ class TestJWTTokenCreation:
         exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
 
         # Should expire in the future (default is typically 15-60 minutes)
-        now = datetime.strptime("2024-01-01 12:00:00", "%Y-%m-%d %H:%M:%S")
         assert exp_datetime > now
 
     def test_create_access_token_custom_expiration(self):
@@ -194,19 +260,20 @@ class TestJWTTokenCreation:
         data = {"sub": "test@example.com"}
         expires_delta = timedelta(hours=2)
 
+        # exp is stored in whole seconds
+        before = datetime.utcnow().replace(microsecond=0)
+
         # Act
-        with freeze_time("2024-01-01 12:00:00"):
-            token = create_access_token(data, expires_delta=expires_delta)
-            decoded = decode_access_token(token)
+        token = create_access_token(data, expires_delta=expires_delta)
+        decoded = decode_access_token(token)
+        after = datetime.utcnow()
 
         # Assert
         assert decoded is not None
         exp_timestamp = decoded["exp"]
         exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
 
-        expected_exp = datetime.strptime("2024-01-01 14:00:00", "%Y-%m-%d %H:%M:%S")
-        # Allow 1 second tolerance
-        assert abs((exp_datetime - expected_exp).total_seconds()) < 1
+        assert before + expires_delta <= exp_datetime <= after + expires_delta
 
     def test_create_access_token_preserves_additional_claims(self):
         """Test that additional claims are preserved in token"""
@@ -243,14 +310,10 @@ class TestJWTTokenCreation:
 class TestJWTTokenDecoding:
     """Test JWT access token decoding"""
 
-    def test_decode_access_token_valid_token(self):
+    def test_decode_access_token_valid_token(self, sample_token):
         """Test decoding a valid token"""
-        # Arrange
-        data = {"sub": "test@example.com"}
-        token = create_access_token(data)
-
         # Act
-        decoded = decode_access_token(token)
+        decoded = decode_access_token(sample_token)
 
         # Assert
         assert decoded is not None
@@ -269,17 +332,6 @@ class TestJWTTokenDecoding:
         # Assert
         assert decoded is None
 
-    def test_decode_access_token_invalid_token(self):
-        """Test that invalid token returns None"""
-        # Arrange
-        invalid_token = "not.a.valid.jwt.token"
-
-        # Act
-        decoded = decode_access_token(invalid_token)
-
-        # Assert
-        assert decoded is None
-
     def test_decode_access_token_tampered_token(self):
         """Test that tampered token returns None"""
         # Arrange
@@ -296,30 +348,21 @@ class TestJWTTokenDecoding:
         # Assert
         assert decoded is None
 
-    def test_decode_access_token_empty_token(self):
-        """Test decoding empty token"""
+    @pytest.mark.parametrize("token", [
+        "not.a.valid.jwt.token",
+        "",
+        "single_part",
+        "only.two.parts",
+        ".....",
+    ], ids=["invalid", "empty", "single_part", "two_parts", "dots_only"])
+    def test_decode_access_token_malformed_token(self, token):
+        """Test that invalid, empty and malformed tokens return None"""
         # Act
-        decoded = decode_access_token("")
+        decoded = decode_access_token(token)
 
         # Assert
         assert decoded is None
 
-    def test_decode_access_token_malformed_token(self):
-        """Test decoding malformed token"""
-        # Arrange
-        malformed_tokens = [
-            "single_part",
-            "only.two.parts",
-            ".....",
-            None
-        ]
-
-        # Act & Assert
-        for token in malformed_tokens:
-            if token is not None:
-                decoded = decode_access_token(token)
-                assert decoded is None
-
     def test_decode_access_token_preserves_all_claims(self):
         """Test that all claims are preserved in decoding"""
         # Arrange
@@ -341,6 +384,39 @@ class TestJWTTokenDecoding:
         assert decoded["permissions"] == ["read", "write"]
         assert decoded["user_id"] == 42
 
+    def test_decode_access_token_cached_until_expiry(self, mocker):
+        """Test that a verified token is reused but never served past exp"""
+        # Arrange
+        with freeze_time("2026-01-01 12:00:00") as frozen:
+            token = create_access_token({"sub": "cache@example.com"}, timedelta(minutes=5))
+            jwt_decode = mocker.spy(security_module.jwt, "decode")
+
+            # Act
+            first = decode_access_token(token)
+            second = decode_access_token(token)
+
+            # Assert
+            assert first == second
+            assert jwt_decode.call_count == 1
+
+            frozen.move_to("2026-01-01 12:10:00")
+            assert decode_access_token(token) is None
+
+    def test_clear_token_cache_forces_reverification(self, mocker):
+        """Test that clearing the token cache makes the next decode verify again"""
+        # Arrange
+        token = create_access_token({"sub": "clear@example.com"})
+        decode_access_token(token)
+        jwt_decode = mocker.spy(security_module.jwt, "decode")
+
+        # Act
+        clear_token_cache()
+        decoded = decode_access_token(token)
+
+        # Assert
+        assert decoded["sub"] == "clear@example.com"
+        assert jwt_decode.call_count == 1
+
 
 class TestJWTTokenLifecycle:
     """Test JWT token lifecycle"""
@@ -352,11 +428,11 @@ class TestJWTTokenLifecycle:
         expires_delta = timedelta(hours=1)
 
         # Act
-        with freeze_time("2024-01-01 12:00:00"):
+        with freeze_time("2024-01-01 12:00:00") as frozen:
             token = create_access_token(data, expires_delta=expires_delta)
 
-        # Still within expiration time
-        with freeze_time("2024-01-01 12:30:00"):
+            # Still within expiration time
+            frozen.move_to("2024-01-01 12:30:00")
             decoded = decode_access_token(token)
 
         # Assert
@@ -370,24 +446,20 @@ class TestJWTTokenLifecycle:
         expires_delta = timedelta(hours=1)
 
         # Act
-        with freeze_time("2024-01-01 12:00:00"):
+        with freeze_time("2024-01-01 12:00:00") as frozen:
             token = create_access_token(data, expires_delta=expires_delta)
 
-        # After expiration time
-        with freeze_time("2024-01-01 13:01:00"):
+            # After expiration time
+            frozen.move_to("2024-01-01 13:01:00")
             decoded = decode_access_token(token)
 
         # Assert
         assert decoded is None
 
-    def test_token_valid_at_creation_time(self):
+    def test_token_valid_at_creation_time(self, sample_token):
         """Test that token is immediately valid after creation"""
-        # Arrange
-        data = {"sub": "test@example.com"}
-
         # Act
-        token = create_access_token(data)
-        decoded = decode_access_token(token)
+        decoded = decode_access_token(sample_token)
 
         # Assert
         assert decoded is not None
@@ -412,6 +484,9 @@ class TestSecurityBestPractices:
     def test_password_hash_has_sufficient_work_factor(self):
         """Test that password hashing uses sufficient work factor"""
         # Arrange
+        # The suite lowers PASSWORD_HASH_COST for speed, so check the
+        # production default and that hashes carry the configured cost
+        default_cost = Settings.model_fields["PASSWORD_HASH_COST"].default
         password = "TestPassword123!"
 
         # Act
@@ -420,30 +495,22 @@ class TestSecurityBestPractices:
         # Assert
         # Bcrypt format: $2b$<cost>$...
         # Cost should be at least 10 for security
-        parts = hashed.split("$")
-        if len(parts) >= 3:
-            cost = int(parts[2])
-            assert cost >= 10, f"Bcrypt cost factor {cost} is too low (should be >= 10)"
+        assert default_cost >= 10, f"Bcrypt cost factor {default_cost} is too low (should be >= 10)"
+        assert int(hashed.split("$")[2]) == settings.PASSWORD_HASH_COST
 
-    def test_jwt_tokens_are_not_predictable(self):
+    def test_jwt_tokens_are_not_predictable(self, token_data):
         """Test that JWT tokens are not predictable"""
-        # Arrange
-        data = {"sub": "test@example.com"}
-
         # Act
-        tokens = [create_access_token(data) for _ in range(5)]
+        tokens = {create_access_token(token_data) for _ in range(5)}
 
         # Assert
         # All tokens should be unique
-        assert len(set(tokens)) == len(tokens)
+        assert len(tokens) == 5
 
-    def test_jwt_includes_signature(self):
+    def test_jwt_includes_signature(self, token_data):
         """Test that JWT tokens include cryptographic signature"""
-        # Arrange
-        data = {"sub": "test@example.com"}
-
         # Act
-        token = create_access_token(data)
+        token = create_access_token(token_data)
         parts = token.split(".")
 
         # Assert
@@ -451,12 +518,12 @@ class TestSecurityBestPractices:
         # Signature part should not be empty
         assert len(parts[2]) > 0
 
-    def test_password_verification_timing_safe(self):
+    def test_password_verification_timing_safe(self, hashed_password):
         """Test that password verification uses constant-time comparison"""
         # This is more of a documentation test - bcrypt is timing-safe by design
         # Arrange
         password = "TestPassword123!"
-        hashed = get_password_hash(password)
+        hashed = hashed_password(password)
 
         # Act & Assert
         # Both should take similar time (bcrypt handles this internally)
@@ -473,10 +540,10 @@ class TestSecurityBestPractices:
     "MySecur3P@ss!",
     "Test1234!@#$",
 ])
-def test_password_hash_and_verify_parametrized(password):
+def test_password_hash_and_verify_parametrized(password, hashed_password):
     """Parametrized test for password hashing and verification"""
     # Arrange & Act
-    hashed = get_password_hash(password)
+    hashed = hashed_password(password)
 
     # Assert
     assert verify_password(password, hashed) is True
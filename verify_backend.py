@@ -15,8 +15,10 @@ async def test_scanner():
     
     # Create a dummy PHP file for testing
     test_file = Path("test_plugin.php")
-    with open(test_file, "w") as f:
-        f.write("<?php\nfunction my_plugin_init() {\n    // This is a test\n    $x = 1;\n}")
+    await asyncio.to_thread(
+        test_file.write_text,
+        "<?php\nfunction my_plugin_init() {\n    // This is a test\n    $x = 1;\n}"
+    )
         
     try:
         print(f"Scanning {test_file}...")
@@ -28,8 +30,7 @@ async def test_scanner():
             print(f"Scan attempted (expected failure if no API key): {e}")
             
     finally:
-        if test_file.exists():
-            os.remove(test_file)
+        await asyncio.to_thread(test_file.unlink, missing_ok=True)
 
 if __name__ == "__main__":
     asyncio.run(test_scanner())
@@ -1,3 +1,4 @@
+import asyncio
 import requests
 import os
 import sys
@@ -14,15 +15,13 @@ API_URL = "http://localhost:8000/api/v1"
 # However, to be thorough, we should try to hit the endpoint if the server was running.
 # Since I can't easily start the full server and keep it running in background while running this script 
 # (I can, but it's complex with tool limitations), I will create a unit-test style script 
-# that imports the app and uses TestClient.
+# that imports the app and calls it in-process over ASGITransport.
 
-from fastapi.testclient import TestClient
+import httpx
 from app.main import app
 from app.core.config import settings
 
-client = TestClient(app)
-
-def test_upload_endpoint():
+async def test_upload_endpoint():
     print("Testing upload endpoint...")
     
     # We need a user and token first, or mock the dependency.
@@ -39,11 +38,12 @@ def test_upload_endpoint():
     mock_db = MagicMock()
     app.dependency_overrides[get_db] = lambda: mock_db
     
-    # Mock Site query
-    mock_site = MagicMock()
-    mock_site.id = 1
-    mock_site.user_id = mock_user.id
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_site
+    # Mock Site query, and no scans yet today for check_scan_limits
+    from types import SimpleNamespace
+    mock_site = SimpleNamespace(id=1, user_id=mock_user.id)
+    filtered = mock_db.query.return_value.filter.return_value
+    filtered.first.return_value = mock_site
+    filtered.count.return_value = 0
     
     # Mock db.refresh to set ID and created_at
     def mock_refresh(obj):
@@ -51,7 +51,7 @@ def test_upload_endpoint():
         from datetime import datetime
         obj.created_at = datetime.now()
         
-    mock_db.refresh.side_effect = mock_refresh
+    mock_db.refresh = mock_refresh
     
     # Create dummy zip
     with open("test.zip", "wb") as f:
@@ -69,7 +69,9 @@ def test_upload_endpoint():
         # or succeed if we mocked enough.
         # Actually, BackgroundTasks might need handling.
         
-        response = client.post("/api/v1/scans/upload", files=files, data=data)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/scans/upload", files=files, data=data)
         
         print(f"Response status: {response.status_code}")
         if response.status_code != 202:
@@ -86,6 +88,6 @@ if __name__ == "__main__":
     os.environ["ANTHROPIC_API_KEY"] = "dummy"
     
     try:
-        test_upload_endpoint()
+        asyncio.run(test_upload_endpoint())
     except Exception as e:
         print(f"Test failed: {e}")